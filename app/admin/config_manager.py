@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import re
 from dataclasses import dataclass
 from pathlib import Path
@@ -10,7 +11,7 @@ from typing import Any, Awaitable, Callable, Mapping
 from dotenv import dotenv_values
 
 from app.core.config import settings
-from app.utils.env_file import update_env_file
+from app.utils.env_file import update_env_file, write_env_text
 from app.utils.logger import logger
 
 ENV_PATH = Path(".env")
@@ -18,6 +19,8 @@ ENV_EXAMPLE_PATH = Path(".env.example")
 _ENV_SOURCE_LINE_PATTERN = re.compile(
     r"^\s*(?:export\s+)?[A-Za-z_][A-Za-z0-9_]*\s*=.*$"
 )
+# 串行化 .env 的读-改-写、重载与回滚，避免并发保存互相覆盖
+_ENV_WRITE_LOCK = asyncio.Lock()
 
 
 @dataclass(frozen=True)
@@ -597,23 +600,24 @@ async def _apply_env_change(
     env_path: str | Path = ENV_PATH,
 ) -> None:
     path = Path(env_path)
-    had_existing_file = path.exists()
-    previous_content = read_env_content(path) if had_existing_file else ""
-
-    try:
-        writer(path)
-        await reload_callback()
-    except Exception:
-        if had_existing_file:
-            path.write_text(previous_content, encoding="utf-8")
-        elif path.exists():
-            path.unlink()
+    async with _ENV_WRITE_LOCK:
+        had_existing_file = path.exists()
+        previous_content = read_env_content(path) if had_existing_file else ""
 
         try:
+            await asyncio.to_thread(writer, path)
             await reload_callback()
-        except Exception as restore_exc:
-            logger.warning(f"⚠️ 回滚配置后重新加载失败: {restore_exc}")
-        raise
+        except Exception:
+            if had_existing_file:
+                await asyncio.to_thread(write_env_text, path, previous_content)
+            elif path.exists():
+                path.unlink()
+
+            try:
+                await reload_callback()
+            except Exception as restore_exc:
+                logger.warning(f"⚠️ 回滚配置后重新加载失败: {restore_exc}")
+            raise
 
 
 async def save_form_config(
@@ -644,10 +648,7 @@ async def save_source_config(
 
     def _writer(target_path: Path) -> None:
         content = normalized.rstrip("\n")
-        target_path.write_text(
-            f"{content}\n" if content else "",
-            encoding="utf-8",
-        )
+        write_env_text(target_path, f"{content}\n" if content else "")
 
     await _apply_env_change(
         _writer,
@@ -670,10 +671,7 @@ async def reset_env_to_example(
 
     def _writer(target_path: Path) -> None:
         content = example_content.rstrip("\n")
-        target_path.write_text(
-            f"{content}\n" if content else "",
-            encoding="utf-8",
-        )
+        write_env_text(target_path, f"{content}\n" if content else "")
 
     await _apply_env_change(
         _writer,
@@ -10,7 +10,7 @@ import psutil
 
 from app.services.request_log_dao import RequestLogDAO, get_request_log_dao
 from app.services.token_dao import TokenDAO, get_token_dao
-from app.utils.token_pool import TokenPool, get_token_pool
+from app.utils.token_pool import get_token_pool
 
 _TOKEN_POOL_SENTINEL = object()
 DEFAULT_TREND_WINDOW = "7d"
@@ -106,8 +106,9 @@ async def collect_admin_stats(
     )
 
     pool_status: Dict[str, Any] = {}
-    if isinstance(token_pool, TokenPool) or hasattr(token_pool, "get_pool_status"):
-        pool_status = token_pool.get_pool_status() if token_pool else {}
+    get_pool_status = getattr(token_pool, "get_pool_status", None)
+    if get_pool_status is not None:
+        pool_status = get_pool_status()
 
     total_tokens = _coerce_int(token_counts.get("total_tokens"))
     enabled_tokens = _coerce_int(token_counts.get("enabled_tokens"))
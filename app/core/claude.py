@@ -5,7 +5,8 @@ import json
 import math
 import time
 import uuid
-from typing import Any, AsyncGenerator, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
 
 from fastapi import APIRouter, Header, Request
 from fastapi.responses import JSONResponse, StreamingResponse
@@ -31,6 +32,7 @@ from app.core.openai import get_upstream_client
 from app.models.schemas import Message, OpenAIRequest
 from app.utils.logger import get_logger
 from app.utils.request_logging import (
+    close_stream,
     extract_openai_usage,
     extract_claude_usage,
     wrap_claude_stream_with_logging,
@@ -42,6 +44,40 @@ logger = get_logger()
 router = APIRouter()
 
 
+CLAUDE_DIRECT_MODEL_SETTINGS = (
+    "GLM45_MODEL",
+    "GLM45_THINKING_MODEL",
+    "GLM45_SEARCH_MODEL",
+    "GLM45_AIR_MODEL",
+    "GLM46V_MODEL",
+    "GLM5_MODEL",
+    "GLM47_MODEL",
+    "GLM47_THINKING_MODEL",
+    "GLM47_SEARCH_MODEL",
+    "GLM47_ADVANCED_SEARCH_MODEL",
+)
+CLAUDE_MODEL_ALIASES = {
+    "default": "GLM5_MODEL",
+    "sonnet": "GLM5_MODEL",
+    "haiku": "GLM45_AIR_MODEL",
+    "opus": "GLM5_MODEL",
+    "opusplan": "GLM47_THINKING_MODEL",
+}
+
+
+@lru_cache(maxsize=4)
+def _build_claude_model_lookup(model_names: Tuple[str, ...]) -> Dict[str, str]:
+    """按当前模型配置预先构建 小写别名 -> 模型名 的查找表。"""
+    models = dict(zip(CLAUDE_DIRECT_MODEL_SETTINGS, model_names))
+    lookup = {
+        alias: models[setting_name]
+        for alias, setting_name in CLAUDE_MODEL_ALIASES.items()
+    }
+    # 直连模型名优先于别名
+    lookup.update({name.casefold(): name for name in model_names})
+    return lookup
+
+
 def _resolve_claude_model(model: Any) -> str:
     """Map Claude/Claude Code model aliases to local upstream-supported models."""
     if not isinstance(model, str) or not model.strip():
@@ -52,30 +88,13 @@ def _resolve_claude_model(model: Any) -> str:
     if normalized.endswith("[1m]"):
         normalized = normalized[:-4].rstrip()
 
-    direct_models = {
-        settings.GLM45_MODEL.casefold(): settings.GLM45_MODEL,
-        settings.GLM45_THINKING_MODEL.casefold(): settings.GLM45_THINKING_MODEL,
-        settings.GLM45_SEARCH_MODEL.casefold(): settings.GLM45_SEARCH_MODEL,
-        settings.GLM45_AIR_MODEL.casefold(): settings.GLM45_AIR_MODEL,
-        settings.GLM46V_MODEL.casefold(): settings.GLM46V_MODEL,
-        settings.GLM5_MODEL.casefold(): settings.GLM5_MODEL,
-        settings.GLM47_MODEL.casefold(): settings.GLM47_MODEL,
-        settings.GLM47_THINKING_MODEL.casefold(): settings.GLM47_THINKING_MODEL,
-        settings.GLM47_SEARCH_MODEL.casefold(): settings.GLM47_SEARCH_MODEL,
-        settings.GLM47_ADVANCED_SEARCH_MODEL.casefold(): settings.GLM47_ADVANCED_SEARCH_MODEL,
-    }
-    if normalized in direct_models:
-        return direct_models[normalized]
-
-    alias_map = {
-        "default": settings.GLM5_MODEL,
-        "sonnet": settings.GLM5_MODEL,
-        "haiku": settings.GLM45_AIR_MODEL,
-        "opus": settings.GLM5_MODEL,
-        "opusplan": settings.GLM47_THINKING_MODEL,
-    }
-    if normalized in alias_map:
-        return alias_map[normalized]
+    # 以配置值为缓存键，配置热重载后自动生成新的查找表
+    lookup = _build_claude_model_lookup(
+        tuple(getattr(settings, name) for name in CLAUDE_DIRECT_MODEL_SETTINGS)
+    )
+    resolved = lookup.get(normalized)
+    if resolved:
+        return resolved
 
     if normalized.startswith("claude-sonnet") or normalized.startswith("claude-3-7-sonnet") or normalized.startswith("claude-3-5-sonnet"):
         return settings.GLM5_MODEL
@@ -356,6 +375,8 @@ async def _stream_openai_to_claude(
     except Exception as exc:
         logger.error(f"❌ Claude 流式响应转换失败: {exc}")
         yield sse_error("api_error", str(exc))
+    finally:
+        await close_stream(openai_stream)
 
 
 @router.post("/v1/messages")
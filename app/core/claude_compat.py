@@ -9,6 +9,8 @@ import json
 import uuid
 from typing import Any, Optional
 
+from app.utils.json_codec import dumps_json
+
 
 def extract_text(content: Any) -> str:
     """Extract plain text from Claude/OpenAI mixed content blocks."""
@@ -245,7 +247,7 @@ def build_non_stream_response(
 
 def sse(event: str, data: dict) -> str:
     """Format a Claude SSE event."""
-    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+    return f"event: {event}\ndata: {dumps_json(data)}\n\n"
 
 
 def sse_message_start(
@@ -18,6 +18,7 @@ from app.models.schemas import (
     OpenAIResponse,
     Usage,
 )
+from app.core.openai_compat import create_chat_id
 from app.core.upstream import UpstreamClient
 from app.utils.logger import get_logger
 from app.utils.request_logging import (
@@ -62,7 +63,7 @@ async def handle_non_stream_response(stream_response, request: OpenAIRequest) ->
                     continue
 
     response_data = OpenAIResponse(
-        id=f"chatcmpl-{int(time.time())}",
+        id=create_chat_id(),
         object="chat.completion",
         created=int(time.time()),
         model=request.model,
@@ -3,11 +3,11 @@
 
 """OpenAI 兼容响应辅助函数。"""
 
-import json
 import time
 import uuid
 from typing import Any, Dict, List, Optional
 
+from app.utils.json_codec import dumps_json
 from app.utils.logger import get_logger
 
 logger = get_logger()
@@ -118,7 +118,7 @@ def create_openai_response_with_reasoning(
 
 async def format_sse_chunk(chunk: Dict[str, Any]) -> str:
     """格式化 SSE 响应块。"""
-    return f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+    return f"data: {dumps_json(chunk)}\n\n"
 
 
 async def format_sse_done() -> str:
@@ -7,13 +7,30 @@ import asyncio
 import base64
 import json
 import random
+import re
 import time
 import uuid
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any, AsyncGenerator, Dict, List, Optional, Set, Tuple, Union
+from functools import lru_cache
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from types import MappingProxyType
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 from urllib.parse import urlencode
 
 import httpx
+import orjson
 
 from app.core.config import settings
 from app.core.openai_compat import (
@@ -25,6 +42,7 @@ from app.core.openai_compat import (
 from app.models.schemas import OpenAIRequest
 from app.utils.fe_version import get_latest_fe_version
 from app.utils.guest_session_pool import get_guest_session_pool
+from app.utils.json_codec import dumps_json_bytes
 from app.utils.logger import get_logger
 from app.utils.signature import generate_signature
 from app.utils.token_pool import get_token_pool
@@ -52,6 +70,18 @@ DEFAULT_PIXEL_RATIO = "1.25"
 DEFAULT_MAX_TOUCH_POINTS = "10"
 DEFAULT_TIMEZONE_OFFSET = "-480"
 DEFAULT_PAGE_TITLE = "Z.ai Chat Proxy"
+SSE_IGNORED_FIELD_PREFIXES = (b":", b"event:", b"id:", b"retry:")
+UPSTREAM_HTTP_MAX_KEEPALIVE_CONNECTIONS = 20
+UPSTREAM_HTTP_MAX_CONNECTIONS = 200
+UPSTREAM_ERROR_PREVIEW_CHARS = 200
+UPSTREAM_RETIRED_CLIENT_GRACE_SECONDS = 300
+IMAGE_UPLOAD_PARALLELISM = 4
+GUEST_AUTH_MAX_RETRIES = 3
+GUEST_AUTH_RETRY_BASE_DELAY_SECONDS = 0.5
+CONCURRENCY_LIMIT_PATTERN = re.compile(
+    r"concurrency|too many requests|并发",
+    re.IGNORECASE,
+)
 DEFAULT_COMPLETION_FEATURES = [
     {"type": "mcp", "server": "vibe-coding", "status": "hidden"},
     {"type": "mcp", "server": "ppt-maker", "status": "hidden"},
@@ -71,6 +101,63 @@ GLM46V_SELECTED_FEATURES = [
     {"type": "mcp", "server": "vlm-image-processing", "status": "selected"},
 ]
 
+# 上游模型专属请求配置，按上游模型 ID 预先构建；只读视图防止单次请求篡改共享配置
+DEFAULT_MODEL_REQUEST_PROFILE: Mapping[str, Any] = MappingProxyType({
+    "use_persisted_chat": False,
+    "preview_mode": True,
+    "mcp_servers": (),
+    "feature_entries": (),
+    "default_enable_thinking": None,
+})
+MODEL_REQUEST_PROFILES: Mapping[str, Mapping[str, Any]] = MappingProxyType({
+    "glm-4.6v": MappingProxyType({
+        "use_persisted_chat": True,
+        "preview_mode": False,
+        "mcp_servers": tuple(GLM46V_MCP_SERVERS),
+        "feature_entries": tuple(GLM46V_SELECTED_FEATURES),
+        "default_enable_thinking": True,
+    }),
+    "glm-5": MappingProxyType({
+        **DEFAULT_MODEL_REQUEST_PROFILE,
+        "default_enable_thinking": True,
+    }),
+    "glm-4.7": MappingProxyType({
+        **DEFAULT_MODEL_REQUEST_PROFILE,
+        "use_persisted_chat": True,
+    }),
+})
+
+@dataclass
+class _ContentSegment:
+    """消息内容片段：文本、原始图片 URL，或待上传图片在上传队列中的序号。"""
+
+    kind: str
+    value: str = ""
+    upload_index: int = -1
+
+
+@dataclass
+class _ParsedMessage:
+    """转换请求时的中间消息；纯文本消息只填 text，多模态消息填 segments。"""
+
+    role: str
+    text: Optional[str] = None
+    segments: List[_ContentSegment] = field(default_factory=list)
+
+
+def _build_stateless_cookie_jar() -> CookieJar:
+    """共享客户端不保存任何 Cookie，避免不同令牌之间串用上游会话。"""
+    return CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+
+def _encode_json_body(body: Dict[str, Any]) -> bytes:
+    """用 orjson 预先序列化请求体，绕开 httpx 内置的标准库 json 编码。"""
+    return dumps_json_bytes(body)
+
+def _guest_auth_retry_delay(attempt: int) -> float:
+    """指数退避 + 抖动，避免并发请求同时重试直连匿名认证。"""
+    ceiling = GUEST_AUTH_RETRY_BASE_DELAY_SECONDS * (2 ** attempt)
+    return ceiling / 2 + random.uniform(0, ceiling / 2)
+
 def generate_uuid() -> str:
     """生成UUID v4"""
     return str(uuid.uuid4())
@@ -167,8 +254,12 @@ def _decode_jwt_payload(token: str) -> Dict[str, Any]:
         return {}
 
 
+@lru_cache(maxsize=256)
 def _extract_user_id_from_token(token: str) -> str:
-    """Extract user_id from a JWT's payload. Fallback to 'guest'."""
+    """Extract user_id from a JWT's payload. Fallback to 'guest'.
+
+    Pool tokens are reused across requests, so the decoded result is memoized.
+    """
     payload = _decode_jwt_payload(token) if token else {}
     for key in ("id", "user_id", "uid", "sub"):
         val = payload.get(key)
@@ -359,6 +450,96 @@ def _extract_last_user_text(messages: List[Dict[str, Any]]) -> str:
     return ""
 
 
+async def _iter_sse_lines(chunks: AsyncIterator[bytes]) -> AsyncGenerator[bytes, None]:
+    """把上游字节块增量切分为行，跨块的半行保留在 bytearray 缓冲区中。"""
+    buffer = bytearray()
+    async for chunk in chunks:
+        buffer += chunk
+        start = 0
+        while True:
+            end = buffer.find(b"\n", start)
+            if end < 0:
+                break
+            yield bytes(buffer[start:end])
+            start = end + 1
+        if start:
+            del buffer[:start]
+
+    if buffer:
+        yield bytes(buffer)
+
+
+def _split_data_payloads(data_lines: List[bytes]) -> List[bytes]:
+    """事件结束时拼接剩余的多行 data；拼接结果无法解析时退回逐行产出。
+
+    完整 JSON 已在读到时提前产出，这里兜底处理缺少空行分隔、又混有
+    非 JSON 内容的事件，避免整段被丢弃成空回复。
+    """
+    payload = b"\n".join(data_lines)
+    if len(data_lines) == 1:
+        return [payload]
+
+    try:
+        orjson.loads(payload)
+    except orjson.JSONDecodeError:
+        logger.warning(
+            f"⚠️ 上游 SSE 事件缺少空行分隔，{len(data_lines)} 行 data 改为逐行解析"
+        )
+        return list(data_lines)
+    return [payload]
+
+
+def _is_complete_json(payload: bytes) -> bool:
+    """判断已缓冲的 data 是否已构成完整 JSON，可立即产出。"""
+    if payload[-1:] not in (b"}", b"]"):
+        return False
+
+    try:
+        orjson.loads(payload)
+    except orjson.JSONDecodeError:
+        return False
+    return True
+
+
+async def _iter_sse_events(
+    chunks: AsyncIterator[bytes],
+) -> AsyncGenerator[Tuple[bool, bytes], None]:
+    """按 SSE 规范增量切分上游事件。
+
+    同一事件内的多行 ``data:`` 以换行拼接；一旦拼接结果已是完整 JSON
+    就立即产出，不必等空行，因此上游只用单个换行分隔事件时也能逐条
+    实时下发。其余情况以空行或响应结束为边界，拼接结果不是合法 JSON
+    时按行拆开。
+
+    产出 ``(is_data, payload)``：``is_data`` 为 False 时表示不符合 SSE
+    格式的原始行（例如上游直接返回的 JSON 错误体）。payload 保持为
+    bytes，可直接交给 orjson 解析，省去整段解码。
+    """
+    data_lines: List[bytes] = []
+    async for raw_line in _iter_sse_lines(chunks):
+        line = raw_line.strip()
+        if not line:
+            if data_lines:
+                for payload in _split_data_payloads(data_lines):
+                    yield True, payload
+                data_lines = []
+            continue
+
+        if line.startswith(b"data:"):
+            data_lines.append(line[5:].strip())
+            payload = (
+                data_lines[0] if len(data_lines) == 1 else b"\n".join(data_lines)
+            )
+            if _is_complete_json(payload):
+                yield True, payload
+                data_lines = []
+        elif not line.startswith(SSE_IGNORED_FIELD_PREFIXES):
+            yield False, line
+
+    if data_lines:
+        for payload in _split_data_payloads(data_lines):
+            yield True, payload
+
 
 class UpstreamClient:
     """当前服务使用的上游适配器。"""
@@ -386,6 +567,12 @@ class UpstreamClient:
             settings.GLM47_ADVANCED_SEARCH_MODEL: "glm-4.7",  # GLM-4.7-advanced-search
         }
 
+        # 聊天请求复用的 HTTP 客户端（懒加载），按代理配置重建
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._http_client_proxy: Optional[str] = None
+        self._client_lock = asyncio.Lock()
+        self._retired_client_tasks: Set[asyncio.Task] = set()
+
     def _get_guest_retry_limit(self) -> int:
         """匿名号池可提供的最大重试预算。"""
         if not settings.ANONYMOUS_MODE:
@@ -587,13 +774,10 @@ class UpstreamClient:
         error_message: str,
     ) -> bool:
         """判断是否为上游并发限制/429 场景。"""
-        message = (error_message or "").casefold()
         return (
             status_code == 429
             or error_code == 429
-            or "concurrency" in message
-            or "too many requests" in message
-            or "并发" in error_message
+            or bool(CONCURRENCY_LIMIT_PATTERN.search(error_message or ""))
         )
     
     def get_supported_models(self) -> List[str]:
@@ -617,33 +801,12 @@ class UpstreamClient:
             self._get_model_request_profile(upstream_model_id)["use_persisted_chat"]
         )
 
-    def _get_model_request_profile(self, upstream_model_id: str) -> Dict[str, Any]:
-        """返回模型专属的请求配置。"""
-        if upstream_model_id == "glm-4.6v":
-            return {
-                "use_persisted_chat": True,
-                "preview_mode": False,
-                "mcp_servers": list(GLM46V_MCP_SERVERS),
-                "feature_entries": [dict(item) for item in GLM46V_SELECTED_FEATURES],
-                "default_enable_thinking": True,
-            }
-
-        if upstream_model_id == "glm-5":
-            return {
-                "use_persisted_chat": False,
-                "preview_mode": True,
-                "mcp_servers": [],
-                "feature_entries": [],
-                "default_enable_thinking": True,
-            }
-
-        return {
-            "use_persisted_chat": upstream_model_id == "glm-4.7",
-            "preview_mode": True,
-            "mcp_servers": [],
-            "feature_entries": [],
-            "default_enable_thinking": None,
-        }
+    def _get_model_request_profile(self, upstream_model_id: str) -> Mapping[str, Any]:
+        """返回模型专属请求配置的只读视图。"""
+        return MODEL_REQUEST_PROFILES.get(
+            upstream_model_id,
+            DEFAULT_MODEL_REQUEST_PROFILE,
+        )
 
     def _build_request_variables(self) -> Dict[str, str]:
         """构建上游请求需要的运行时变量。"""
@@ -846,22 +1009,19 @@ class UpstreamClient:
             "Origin": self.base_url,
             "Referer": f"{self.base_url}/",
         }
-        async with httpx.AsyncClient(
-            base_url=self.base_url,
+        client = await self._get_http_client()
+        response = await client.post(
+            f"{self.base_url}/api/v1/chats/new",
+            headers=request_headers,
+            content=_encode_json_body(body),
             timeout=self._build_timeout(),
-            limits=self._build_limits(),
-            proxy=self._get_proxy_config(),
             follow_redirects=True,
-        ) as client:
-            response = await client.post(
-                "/api/v1/chats/new",
-                headers=request_headers,
-                json=body,
-            )
+        )
 
         if response.status_code != 200:
             raise RuntimeError(
-                f"上游创建 chat 失败: {response.status_code} {response.text}"
+                f"上游创建 chat 失败: {response.status_code} "
+                f"{response.text[:UPSTREAM_ERROR_PREVIEW_CHARS]}"
             )
 
         payload = response.json()
@@ -1046,9 +1206,70 @@ class UpstreamClient:
             max_connections=10,
         )
 
+    def _build_shared_limits(self) -> httpx.Limits:
+        """Create connection-pool limits for the shared upstream chat client."""
+        return httpx.Limits(
+            max_keepalive_connections=UPSTREAM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            max_connections=UPSTREAM_HTTP_MAX_CONNECTIONS,
+        )
+
+    async def _get_http_client(self) -> httpx.AsyncClient:
+        """获取复用的上游 HTTP 客户端，避免每次请求重新建连和握手。
+
+        开启 HTTP/2 后，并发请求可在同一条 TLS 连接上多路复用。
+
+        代理配置热重载后会重建客户端；旧客户端留给在途请求一段宽限期后再关闭。
+        """
+        proxy = self._get_proxy_config()
+        if self._http_client is not None and self._http_client_proxy == proxy:
+            return self._http_client
+
+        async with self._client_lock:
+            if self._http_client is None or self._http_client_proxy != proxy:
+                if self._http_client is not None:
+                    self._retire_http_client(self._http_client)
+                self._http_client = httpx.AsyncClient(
+                    timeout=self._build_timeout(read_timeout=60.0),
+                    http2=True,
+                    limits=self._build_shared_limits(),
+                    proxy=proxy,
+                    cookies=_build_stateless_cookie_jar(),
+                )
+                self._http_client_proxy = proxy
+        return self._http_client
+
+    def _retire_http_client(self, client: httpx.AsyncClient):
+        """宽限期结束后关闭被替换的客户端，避免其连接池泄漏。"""
+
+        async def _close_later():
+            try:
+                await asyncio.sleep(UPSTREAM_RETIRED_CLIENT_GRACE_SECONDS)
+            finally:
+                await client.aclose()
+
+        task = asyncio.create_task(_close_later())
+        self._retired_client_tasks.add(task)
+        task.add_done_callback(self._retired_client_tasks.discard)
+
+    async def close(self):
+        """关闭复用的上游 HTTP 客户端，并立即关闭仍在宽限期内的旧客户端。"""
+        async with self._client_lock:
+            client = self._http_client
+            self._http_client = None
+            self._http_client_proxy = None
+            retired_tasks = list(self._retired_client_tasks)
+
+        for task in retired_tasks:
+            task.cancel()
+        if retired_tasks:
+            await asyncio.gather(*retired_tasks, return_exceptions=True)
+
+        if client is not None:
+            await client.aclose()
+
     async def _fetch_direct_guest_auth(self) -> Dict[str, Any]:
         """匿名号池缺席时，兜底直连拉取一个访客令牌。"""
-        max_retries = 3
+        max_retries = GUEST_AUTH_MAX_RETRIES
 
         for retry_count in range(max_retries):
             try:
@@ -1120,7 +1341,7 @@ class UpstreamClient:
                 )
 
             if retry_count + 1 < max_retries:
-                await asyncio.sleep(2)
+                await asyncio.sleep(_guest_auth_retry_delay(retry_count))
 
         return {
             "token": "",
@@ -1248,64 +1469,91 @@ class UpstreamClient:
                 "Authorization": f"Bearer {token}",
             }
 
-            # Get proxy configuration
-            proxies = self._get_proxy_config()
-
-            # 使用 httpx 上传文件
-            async with httpx.AsyncClient(
+            # 复用共享客户端上传文件
+            client = await self._get_http_client()
+            files = {
+                "file": (filename, image_data, mime_type)
+            }
+            response = await client.post(
+                upload_url,
+                files=files,
+                headers=headers,
                 timeout=self._build_timeout(),
-                limits=self._build_limits(),
-                proxy=proxies,
-            ) as client:
-                files = {
-                    "file": (filename, image_data, mime_type)
-                }
-                response = await client.post(upload_url, files=files, headers=headers)
+            )
 
-                if response.status_code == 200:
-                    result = response.json()
-                    file_id = result.get("id")
-                    file_name = result.get("filename")
-                    file_size = len(image_data)
+            if response.status_code == 200:
+                result = response.json()
+                file_id = result.get("id")
+                file_name = result.get("filename")
+                file_size = len(image_data)
 
-                    self.logger.info(f"✅ 图片上传成功: {file_id}_{file_name}")
+                self.logger.info(f"✅ 图片上传成功: {file_id}_{file_name}")
 
-                    # 返回符合上游格式的文件信息
-                    current_timestamp = int(time.time())
-                    return {
-                        "type": "image",
-                        "file": {
-                            "id": file_id,
-                            "user_id": user_id,
-                            "hash": None,
-                            "filename": file_name,
+                # 返回符合上游格式的文件信息
+                current_timestamp = int(time.time())
+                return {
+                    "type": "image",
+                    "file": {
+                        "id": file_id,
+                        "user_id": user_id,
+                        "hash": None,
+                        "filename": file_name,
+                        "data": {},
+                        "meta": {
+                            "name": file_name,
+                            "content_type": mime_type,
+                            "size": file_size,
                             "data": {},
-                            "meta": {
-                                "name": file_name,
-                                "content_type": mime_type,
-                                "size": file_size,
-                                "data": {},
-                            },
-                            "created_at": current_timestamp,
-                            "updated_at": current_timestamp
                         },
-                        "id": file_id,
-                        "url": f"/api/v1/files/{file_id}/content",
-                        "name": file_name,
-                        "status": "uploaded",
-                        "size": file_size,
-                        "error": "",
-                        "itemId": str(uuid.uuid4()),
-                        "media": "image"
-                    }
-                else:
-                    self.logger.error(f"❌ 图片上传失败: {response.status_code} - {response.text}")
-                    return None
+                        "created_at": current_timestamp,
+                        "updated_at": current_timestamp
+                    },
+                    "id": file_id,
+                    "url": f"/api/v1/files/{file_id}/content",
+                    "name": file_name,
+                    "status": "uploaded",
+                    "size": file_size,
+                    "error": "",
+                    "itemId": str(uuid.uuid4()),
+                    "media": "image"
+                }
+            else:
+                self.logger.error(
+                    f"❌ 图片上传失败: {response.status_code} - "
+                    f"{response.text[:UPSTREAM_ERROR_PREVIEW_CHARS]}"
+                )
+                return None
 
         except Exception as e:
             self.logger.error(f"❌ 图片上传异常: {e}")
             return None
 
+    async def _upload_images_concurrently(
+        self,
+        image_urls: List[str],
+        chat_id: str,
+        token: str,
+        user_id: str,
+        auth_mode: str = "authenticated",
+    ) -> List[Optional[Dict[str, Any]]]:
+        """限流并发上传多张 base64 图片，结果与输入顺序一致。"""
+        if not image_urls:
+            return []
+
+        semaphore = asyncio.Semaphore(IMAGE_UPLOAD_PARALLELISM)
+
+        async def _upload(image_url: str) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                return await self.upload_image(
+                    image_url,
+                    chat_id,
+                    token,
+                    user_id,
+                    auth_mode=auth_mode,
+                )
+
+        return list(await asyncio.gather(*(_upload(url) for url in image_urls)))
+
     async def transform_request(
         self,
         request: OpenAIRequest,
@@ -1377,39 +1625,39 @@ class UpstreamClient:
         files = []
         upload_chat_id = "" if use_persisted_chat else chat_id
 
+        # 先收集各消息的内容片段，base64 图片统一并发上传后再按原顺序组装
+        parsed_messages: List[_ParsedMessage] = []
+        pending_uploads: List[str] = []
         for msg in normalized_messages:
             role = str(msg.get("role", "user"))
             content = msg.get("content")
 
             if isinstance(content, str):
-                messages.append({"role": role, "content": content})
+                parsed_messages.append(_ParsedMessage(role=role, text=content))
                 continue
 
             if not isinstance(content, list):
                 continue
 
-            text_parts = []
-            image_parts = []
+            segments: List[_ContentSegment] = []
             for part in content:
                 image_url = None
-                if hasattr(part, "type"):
-                    if part.type == "text" and hasattr(part, "text"):
-                        text_parts.append(part.text or "")
-                    elif part.type == "image_url" and hasattr(part, "image_url"):
-                        if hasattr(part.image_url, "url"):
-                            image_url = part.image_url.url
-                        elif (
-                            isinstance(part.image_url, dict)
-                            and "url" in part.image_url
-                        ):
-                            image_url = part.image_url["url"]
+                part_type = getattr(part, "type", None)
+                if part_type is not None:
+                    if part_type == "text" and hasattr(part, "text"):
+                        segments.append(_ContentSegment("text", part.text or ""))
+                    elif part_type == "image_url" and hasattr(part, "image_url"):
+                        part_image = part.image_url
+                        image_url = getattr(part_image, "url", None)
+                        if image_url is None and isinstance(part_image, dict):
+                            image_url = part_image.get("url")
                 elif isinstance(part, dict):
                     if part.get("type") == "text":
-                        text_parts.append(part.get("text", ""))
+                        segments.append(_ContentSegment("text", part.get("text", "")))
                     elif part.get("type") == "image_url":
                         image_url = part.get("image_url", {}).get("url", "")
                 elif isinstance(part, str):
-                    text_parts.append(part)
+                    segments.append(_ContentSegment("text", part))
 
                 if not image_url:
                     continue
@@ -1417,40 +1665,66 @@ class UpstreamClient:
                 self.logger.debug(f"✅ 检测到图片: {image_url[:50]}...")
                 if image_url.startswith("data:") and auth_mode != "guest":
                     self.logger.info("🔄 上传 base64 图片到上游服务")
-                    file_info = await self.upload_image(
-                        image_url,
-                        upload_chat_id,
-                        token,
-                        user_id,
-                        auth_mode=auth_mode,
+                    segments.append(
+                        _ContentSegment("upload", upload_index=len(pending_uploads))
                     )
-                    if not file_info:
-                        self.logger.warning("⚠️ 图片上传失败")
-                        text_parts.append("[系统提示: 图片上传失败]")
-                        continue
+                    pending_uploads.append(image_url)
+                    continue
 
-                    files.append(file_info)
-                    self.logger.info("✅ 图片已添加到 files 数组")
-                    if persisted_user_message_id:
-                        file_info["ref_user_msg_id"] = persisted_user_message_id
-                    image_ref = str(file_info["id"])
+                if auth_mode != "guest":
+                    self.logger.warning("⚠️ 非 base64 图片或匿名模式，保留原始URL")
+                segments.append(_ContentSegment("image", image_url))
+
+            parsed_messages.append(_ParsedMessage(role=role, segments=segments))
+
+        uploaded_files = await self._upload_images_concurrently(
+            pending_uploads,
+            upload_chat_id,
+            token,
+            user_id,
+            auth_mode=auth_mode,
+        )
+
+        for parsed in parsed_messages:
+            role = parsed.role
+            if parsed.text is not None:
+                messages.append({"role": role, "content": parsed.text})
+                continue
+
+            text_parts = []
+            image_parts = []
+            for segment in parsed.segments:
+                if segment.kind == "text":
+                    text_parts.append(segment.value)
+                    continue
+
+                if segment.kind == "image":
                     image_parts.append(
                         {
                             "type": "image_url",
-                            "image_url": {"url": image_ref},
+                            "image_url": {"url": segment.value},
                         }
                     )
-                    self.logger.debug(f"📎 图片引用: {image_ref}")
                     continue
 
-                if auth_mode != "guest":
-                    self.logger.warning("⚠️ 非 base64 图片或匿名模式，保留原始URL")
+                file_info = uploaded_files[segment.upload_index]
+                if not file_info:
+                    self.logger.warning("⚠️ 图片上传失败")
+                    text_parts.append("[系统提示: 图片上传失败]")
+                    continue
+
+                files.append(file_info)
+                self.logger.info("✅ 图片已添加到 files 数组")
+                if persisted_user_message_id:
+                    file_info["ref_user_msg_id"] = persisted_user_message_id
+                image_ref = str(file_info["id"])
                 image_parts.append(
                     {
                         "type": "image_url",
-                        "image_url": {"url": image_url},
+                        "image_url": {"url": image_ref},
                     }
                 )
+                self.logger.debug(f"📎 图片引用: {image_ref}")
 
             message_content = []
             combined_text = " ".join(text_parts).strip()
@@ -1623,26 +1897,26 @@ class UpstreamClient:
             if request.stream:
                 return self._create_stream_response(request, transformed)
 
-            proxies = self._get_proxy_config()
             max_attempts = self._get_total_retry_limit()
             excluded_tokens: Set[str] = set()
             excluded_guest_user_ids: Set[str] = set()
 
             for attempt in range(max_attempts):
-                async with httpx.AsyncClient(
-                    timeout=self._build_timeout(read_timeout=60.0),
-                    limits=self._build_limits(),
-                    proxy=proxies,
-                ) as client:
-                    response = await client.post(
-                        transformed["url"],
-                        headers=transformed["headers"],
-                        json=transformed["body"],
-                    )
+                client = await self._get_http_client()
+                response = await client.post(
+                    transformed["url"],
+                    headers=transformed["headers"],
+                    content=_encode_json_body(transformed["body"]),
+                )
 
-                error_code, error_message = self._extract_upstream_error_details(
-                    response.status_code,
-                    response.text,
+                # 成功响应体是完整的 SSE 文本，无需解码解析错误信息
+                error_code, error_message = (
+                    self._extract_upstream_error_details(
+                        response.status_code,
+                        response.text,
+                    )
+                    if response.status_code != 200
+                    else (None, "")
                 )
                 is_concurrency_limited = self._is_concurrency_limited(
                     response.status_code,
@@ -1743,152 +2017,152 @@ class UpstreamClient:
         current_token = str(transformed.get("token") or "")
 
         try:
-            proxies = self._get_proxy_config()
-
-            async with httpx.AsyncClient(
-                timeout=self._build_timeout(read_timeout=180.0),
-                http2=True,
-                limits=self._build_limits(),
-                proxy=proxies,
-            ) as client:
-                for attempt in range(max_attempts):
-                    self.logger.info(f"🎯 发送请求到上游: {transformed['url']}")
-                    async with client.stream(
-                        "POST",
-                        transformed["url"],
-                        json=transformed["body"],
-                        headers=transformed["headers"],
-                    ) as response:
-                        error_text = await response.aread() if response.status_code != 200 else b""
-                        error_msg = error_text.decode("utf-8", errors="ignore")
-                        error_code, parsed_error_message = (
-                            self._extract_upstream_error_details(
-                                response.status_code,
-                                error_msg,
-                            )
-                            if response.status_code != 200
-                            else (None, "")
-                        )
-                        is_concurrency_limited = self._is_concurrency_limited(
+            client = await self._get_http_client()
+            stream_timeout = self._build_timeout(read_timeout=180.0)
+
+            for attempt in range(max_attempts):
+                self.logger.info(f"🎯 发送请求到上游: {transformed['url']}")
+                async with client.stream(
+                    "POST",
+                    transformed["url"],
+                    content=_encode_json_body(transformed["body"]),
+                    headers=transformed["headers"],
+                    timeout=stream_timeout,
+                ) as response:
+                    error_text = (
+                        await response.aread()
+                        if response.status_code != 200
+                        else b""
+                    )
+                    error_msg = error_text.decode("utf-8", errors="ignore")
+                    error_code, parsed_error_message = (
+                        self._extract_upstream_error_details(
                             response.status_code,
-                            error_code,
-                            parsed_error_message,
+                            error_msg,
                         )
+                        if response.status_code != 200
+                        else (None, "")
+                    )
+                    is_concurrency_limited = self._is_concurrency_limited(
+                        response.status_code,
+                        error_code,
+                        parsed_error_message,
+                    )
 
-                        if self._should_retry_guest_session(
-                            response.status_code,
-                            is_concurrency_limited,
+                    if self._should_retry_guest_session(
+                        response.status_code,
+                        is_concurrency_limited,
+                        attempt,
+                        max_attempts,
+                        transformed,
+                    ):
+                        guest_user_id = str(
+                            transformed.get("guest_user_id")
+                            or transformed.get("user_id")
+                            or ""
+                        )
+                        if guest_user_id:
+                            excluded_guest_user_ids.add(guest_user_id)
+                        transformed = await self._refresh_guest_request(
+                            request,
                             attempt,
-                            max_attempts,
+                            excluded_tokens,
+                            excluded_guest_user_ids,
                             transformed,
-                        ):
-                            guest_user_id = str(
-                                transformed.get("guest_user_id")
-                                or transformed.get("user_id")
-                                or ""
+                            is_concurrency_limited=is_concurrency_limited,
+                        )
+                        current_token = str(transformed.get("token") or "")
+                        continue
+
+                    if self._should_retry_authenticated_session(
+                        response.status_code,
+                        is_concurrency_limited,
+                        attempt,
+                        max_attempts,
+                        transformed,
+                    ):
+                        if current_token:
+                            excluded_tokens.add(current_token)
+                            await self.mark_token_failure(
+                                current_token,
+                                Exception(
+                                    parsed_error_message or "上游认证会话不可用"
+                                ),
                             )
-                            if guest_user_id:
-                                excluded_guest_user_ids.add(guest_user_id)
-                            transformed = await self._refresh_guest_request(
-                                request,
-                                attempt,
-                                excluded_tokens,
-                                excluded_guest_user_ids,
-                                transformed,
-                                is_concurrency_limited=is_concurrency_limited,
+                            self.logger.warning(
+                                "⚠️ 流式请求命中认证会话限制，准备切号/回退匿名池: "
+                                f"{current_token[:20]}..."
                             )
-                            current_token = str(transformed.get("token") or "")
-                            continue
-
-                        if self._should_retry_authenticated_session(
-                            response.status_code,
-                            is_concurrency_limited,
+                        transformed = await self._refresh_authenticated_request(
+                            request,
                             attempt,
-                            max_attempts,
-                            transformed,
-                        ):
-                            if current_token:
-                                excluded_tokens.add(current_token)
-                                await self.mark_token_failure(
-                                    current_token,
-                                    Exception(
-                                        parsed_error_message or "上游认证会话不可用"
-                                    ),
-                                )
-                                self.logger.warning(
-                                    "⚠️ 流式请求命中认证会话限制，准备切号/回退匿名池: "
-                                    f"{current_token[:20]}..."
-                                )
-                            transformed = await self._refresh_authenticated_request(
-                                request,
-                                attempt,
-                                excluded_tokens,
-                                excluded_guest_user_ids,
+                            excluded_tokens,
+                            excluded_guest_user_ids,
+                        )
+                        current_token = str(transformed.get("token") or "")
+                        continue
+
+                    if response.status_code != 200:
+                        self.logger.error(f"❌ 上游返回错误: {response.status_code}")
+                        if error_msg:
+                            self.logger.error(f"❌ 错误详情: {error_msg}")
+
+                        if not self._is_guest_auth(transformed) and current_token:
+                            await self.mark_token_failure(
+                                current_token,
+                                Exception(
+                                    parsed_error_message
+                                    or f"Upstream error: {response.status_code}"
+                                ),
                             )
-                            current_token = str(transformed.get("token") or "")
-                            continue
-
-                        if response.status_code != 200:
-                            self.logger.error(f"❌ 上游返回错误: {response.status_code}")
-                            if error_msg:
-                                self.logger.error(f"❌ 错误详情: {error_msg}")
-
-                            if not self._is_guest_auth(transformed) and current_token:
-                                await self.mark_token_failure(
-                                    current_token,
-                                    Exception(
-                                        parsed_error_message
-                                        or f"Upstream error: {response.status_code}"
+                        await self._release_guest_session(transformed)
+
+                        if response.status_code == 405:
+                            self.logger.error(
+                                "🚫 请求被上游 WAF 拦截，可能是请求头或签名异常"
+                            )
+                            error_response = {
+                                "error": {
+                                    "message": (
+                                        "请求被上游WAF拦截(405 Method Not Allowed),"
+                                        "可能是请求头或签名异常,请稍后重试..."
                                     ),
-                                )
-                            await self._release_guest_session(transformed)
-
-                            if response.status_code == 405:
-                                self.logger.error(
-                                    "🚫 请求被上游 WAF 拦截，可能是请求头或签名异常"
-                                )
-                                error_response = {
-                                    "error": {
-                                        "message": (
-                                            "请求被上游WAF拦截(405 Method Not Allowed),"
-                                            "可能是请求头或签名异常,请稍后重试..."
-                                        ),
-                                        "type": "waf_blocked",
-                                        "code": 405,
-                                    }
+                                    "type": "waf_blocked",
+                                    "code": 405,
                                 }
-                            else:
-                                error_response = {
-                                    "error": {
-                                        "message": parsed_error_message
-                                        or f"Upstream error: {response.status_code}",
-                                        "type": "upstream_error",
-                                        "code": error_code or response.status_code,
-                                    }
+                            }
+                        else:
+                            error_response = {
+                                "error": {
+                                    "message": parsed_error_message
+                                    or f"Upstream error: {response.status_code}",
+                                    "type": "upstream_error",
+                                    "code": error_code or response.status_code,
                                 }
-                            yield f"data: {json.dumps(error_response)}\n\n"
-                            yield "data: [DONE]\n\n"
-                            return
-
-                        chat_id = transformed["chat_id"]
-                        model = transformed["model"]
-                        try:
-                            async for chunk in self._handle_stream_response(
-                                response,
-                                chat_id,
-                                model,
-                                request,
-                                transformed,
-                            ):
-                                yield chunk
-                        finally:
-                            await self._release_guest_session(transformed)
-
-                        if not self._is_guest_auth(transformed) and current_token:
-                            token_pool = get_token_pool()
-                            if token_pool:
-                                await token_pool.record_token_success(current_token)
+                            }
+                        yield f"data: {json.dumps(error_response)}\n\n"
+                        yield "data: [DONE]\n\n"
                         return
+
+                    chat_id = transformed["chat_id"]
+                    model = transformed["model"]
+                    try:
+                        async for chunk in self._handle_stream_response(
+                            response,
+                            chat_id,
+                            model,
+                            request,
+                            transformed,
+                        ):
+                            yield chunk
+                    finally:
+                        await self._release_guest_session(transformed)
+
+                    if not self._is_guest_auth(transformed) and current_token:
+                        token_pool = get_token_pool()
+                        if token_pool:
+                            await token_pool.record_token_success(current_token)
+                    return
         except Exception as e:
             self.logger.error(f"❌ 流处理错误: {e}")
             import traceback
@@ -1944,7 +2218,8 @@ class UpstreamClient:
         tool_calls_accum: List[Dict[str, Any]] = []
         has_sent_role = False
         finished = False
-        line_count = 0
+        event_count = 0
+        last_phase: Optional[str] = None
 
         async def ensure_role_sent() -> Optional[str]:
             nonlocal has_sent_role
@@ -1996,28 +2271,24 @@ class UpstreamClient:
             finished = True
 
         try:
-            async for line in response.aiter_lines():
-                line_count += 1
-                if not line:
+            async for is_data, payload in _iter_sse_events(response.aiter_bytes()):
+                if not is_data:
                     continue
 
-                current_line = line.strip()
-                if not current_line.startswith("data:"):
+                event_count += 1
+                if not payload:
                     continue
 
-                chunk_str = current_line[5:].strip()
-                if not chunk_str:
-                    continue
-
-                if chunk_str == "[DONE]":
+                if payload == b"[DONE]":
                     async for final_chunk in finalize_stream():
                         yield final_chunk
                     continue
 
                 try:
-                    chunk = json.loads(chunk_str)
-                except json.JSONDecodeError as error:
-                    self.logger.debug(f"❌ JSON解析错误: {error}, 内容: {chunk_str[:1000]}")
+                    chunk = orjson.loads(payload)
+                except orjson.JSONDecodeError as error:
+                    preview = payload[:1000].decode("utf-8", errors="ignore")
+                    self.logger.debug(f"❌ JSON解析错误: {error}, 内容: {preview}")
                     continue
 
                 chunk_type = chunk.get("type")
@@ -2029,9 +2300,9 @@ class UpstreamClient:
                 delta_content = data.get("delta_content", "")
                 edit_content = data.get("edit_content", "")
 
-                if phase and phase != getattr(self, "_last_phase", None):
+                if phase and phase != last_phase:
                     self.logger.info(f"📈 SSE 阶段: {phase}")
-                    self._last_phase = phase
+                    last_phase = phase
 
                 if data.get("usage"):
                     usage_info = data["usage"]
@@ -2120,7 +2391,7 @@ class UpstreamClient:
                         yield final_chunk
                     return
 
-            self.logger.info(f"✅ SSE 流处理完成，共处理 {line_count} 行数据")
+            self.logger.info(f"✅ SSE 流处理完成，共处理 {event_count} 个事件")
 
             if not finished:
                 async for final_chunk in finalize_stream():
@@ -2152,14 +2423,10 @@ class UpstreamClient:
         }
 
         try:
-            async for line in response.aiter_lines():
-                if not line:
-                    continue
-
-                line = line.strip()
-                if not line.startswith("data:"):
+            async for is_data, payload in _iter_sse_events(response.aiter_bytes()):
+                if not is_data:
                     try:
-                        maybe_err = json.loads(line)
+                        maybe_err = orjson.loads(payload)
                         if isinstance(maybe_err, dict) and (
                             "error" in maybe_err or "code" in maybe_err or "message" in maybe_err
                         ):
@@ -2173,13 +2440,12 @@ class UpstreamClient:
                         pass
                     continue
 
-                data_str = line[5:].strip()
-                if not data_str or data_str in ("[DONE]", "DONE", "done"):
+                if not payload or payload in (b"[DONE]", b"DONE", b"done"):
                     continue
 
                 try:
-                    chunk = json.loads(data_str)
-                except json.JSONDecodeError:
+                    chunk = orjson.loads(payload)
+                except orjson.JSONDecodeError:
                     continue
 
                 chunk_type = chunk.get("type")
@@ -2,16 +2,21 @@
 Token 数据访问层 (DAO)
 提供 Token 的 CRUD 操作和查询功能
 """
+import asyncio
 import os
 import sqlite3
 from contextlib import asynccontextmanager
 from typing import Any, Dict, List, Optional, Tuple
 
 import aiosqlite
+import httpx
 
 from app.models.token_db import DB_PATH, SQL_CREATE_TABLES
 from app.utils.logger import logger
 
+# 批量验证时同时在途的上游校验请求上限
+TOKEN_VALIDATION_PARALLELISM = 8
+
 
 class TokenDAO:
     """Token 数据访问对象"""
@@ -585,13 +590,27 @@ class TokenDAO:
                 "invalid_token_ids": [],
             }
 
-            for token_record in tokens:
-                token_id = int(token_record["id"])
-                token = str(token_record["token"])
-
-                token_type, is_valid, error_msg = await ZAITokenValidator.validate_token(
-                    token
+            semaphore = asyncio.Semaphore(TOKEN_VALIDATION_PARALLELISM)
+
+            async def _validate(
+                token_record,
+                client: httpx.AsyncClient,
+            ) -> Tuple[str, bool, Optional[str]]:
+                async with semaphore:
+                    return await ZAITokenValidator.validate_token(
+                        str(token_record["token"]),
+                        client=client,
+                    )
+
+            # 上游校验并发执行并复用同一客户端；
+            # SQLite 写入仍逐条进行，避免多连接争用写锁
+            async with httpx.AsyncClient(timeout=15.0) as client:
+                results = await asyncio.gather(
+                    *(_validate(token_record, client) for token_record in tokens)
                 )
+
+            for token_record, (token_type, is_valid, error_msg) in zip(tokens, results):
+                token_id = int(token_record["id"])
                 await self.update_token_type(token_id, token_type)
 
                 if token_type == "user" and is_valid:
@@ -2,13 +2,25 @@
 
 from __future__ import annotations
 
+import os
 import re
+import tempfile
 from pathlib import Path
 from typing import Mapping
 
 _ENV_KEY_PATTERN = re.compile(r"^\s*([A-Za-z_][A-Za-z0-9_]*)\s*=")
 
 
+def _read_default_file_mode() -> int:
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+# mkstemp always creates 0600 files; new .env files should follow the umask instead.
+_DEFAULT_FILE_MODE = _read_default_file_mode()
+
+
 def _serialize_env_value(value: object) -> str:
     if isinstance(value, bool):
         return "true" if value else "false"
@@ -29,6 +41,30 @@ def _serialize_env_value(value: object) -> str:
     return text
 
 
+def write_env_text(path: str | Path, content: str) -> None:
+    """Atomically replace ``path`` so readers never observe a half-written file.
+
+    Symlinks are resolved first so the link itself survives and its target is
+    updated in place.
+    """
+    target = Path(path).resolve()
+    fd, tmp_name = tempfile.mkstemp(
+        prefix=f".{target.name}.", suffix=".tmp", dir=target.parent
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(content)
+        mode = target.stat().st_mode & 0o777 if target.exists() else _DEFAULT_FILE_MODE
+        os.chmod(tmp_name, mode)
+        os.replace(tmp_name, target)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+
+
 def update_env_file(
     updates: Mapping[str, object],
     env_path: str | Path = ".env",
@@ -56,4 +92,4 @@ def update_env_file(
             lines.append(f"{key}={value}")
 
     content = "\n".join(lines).rstrip()
-    path.write_text(f"{content}\n" if content else "", encoding="utf-8")
+    write_env_text(path, f"{content}\n" if content else "")
@@ -8,12 +8,15 @@ The upstream service embeds the current front-end release identifier inside
 its landing page static asset URLs (e.g. `prod-fe-1.0.107`). The helpers in
 this module fetch the landing page, extract the version string, and cache it
 with a configurable TTL so the expensive network fetch only happens when
-necessary.
+necessary. Once a version has been cached, an expired entry is still served
+immediately while a background thread refreshes it (stale-while-revalidate),
+so request paths never block on the landing page fetch.
 """
 
 from __future__ import annotations
 
 import re
+import threading
 import time
 from typing import Optional
 
@@ -28,11 +31,17 @@ FE_VERSION_SOURCE_URL = "https://chat.z.ai"
 # Cache TTL in seconds (default: 30 minutes).
 CACHE_TTL_SECONDS = 1800
 
+# Delay before retrying a failed background refresh while serving the stale value.
+STALE_RETRY_INTERVAL_SECONDS = 60
+
 _logger = get_logger()
 _version_pattern = re.compile(r"prod-fe-\d+\.\d+\.\d+")
 
 _cached_version: str = ""
+# Monotonic timestamp used only for TTL checks, immune to wall-clock adjustments.
 _cached_at: float = 0.0
+_refresh_lock = threading.Lock()
+_refresh_in_flight = False
 
 
 def _extract_version(page_content: str) -> Optional[str]:
@@ -58,29 +67,15 @@ def _should_use_cache(force_refresh: bool) -> bool:
         return False
     if _cached_at <= 0:
         return False
-    return (time.time() - _cached_at) < CACHE_TTL_SECONDS
-
-
-def get_latest_fe_version(force_refresh: bool = False) -> str:
-    """
-    Resolve the latest X-FE-Version value from chat.z.ai.
+    return (time.monotonic() - _cached_at) < CACHE_TTL_SECONDS
 
-    The lookup order is:
-        1. Cached value within TTL.
-        2. Remote fetch from chat.z.ai.
-    
-    Raises:
-        Exception: If unable to fetch the version from the remote source.
-    """
-    global _cached_version, _cached_at
-
-    if _should_use_cache(force_refresh):
-        return _cached_version
 
+def _build_request_headers() -> dict:
+    """Build the headers used to fetch the landing page."""
     try:
-        headers = {"User-Agent": get_random_user_agent("chrome")}
+        return {"User-Agent": get_random_user_agent("chrome")}
     except Exception:
-        headers = {
+        return {
             "User-Agent": (
                 "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
                 "AppleWebKit/537.36 (KHTML, like Gecko) "
@@ -88,25 +83,87 @@ def get_latest_fe_version(force_refresh: bool = False) -> str:
             )
         }
 
+
+def _fetch_remote_version() -> str:
+    """Fetch the landing page, update the cache and return the version."""
+    global _cached_version, _cached_at
+
     try:
         with httpx.Client(timeout=10.0, follow_redirects=True) as client:
-            response = client.get(FE_VERSION_SOURCE_URL, headers=headers)
+            response = client.get(
+                FE_VERSION_SOURCE_URL,
+                headers=_build_request_headers(),
+            )
             response.raise_for_status()
             version = _extract_version(response.text)
             if version:
                 if version != _cached_version:
                     _logger.info(f"[Z.AI] Detected X-FE-Version update: {version}")
                 _cached_version = version
-                _cached_at = time.time()
+                _cached_at = time.monotonic()
                 return version
 
             _logger.error("[Z.AI] Unable to locate X-FE-Version in landing page")
             raise Exception("Unable to locate X-FE-Version in landing page")
     except Exception as exc:
-        _logger.error(f"[Z.AI] Failed to fetch X-FE-Version from {FE_VERSION_SOURCE_URL}: {exc}")
+        _logger.error(
+            f"[Z.AI] Failed to fetch X-FE-Version from {FE_VERSION_SOURCE_URL}: {exc}"
+        )
         raise Exception(f"Failed to fetch X-FE-Version: {exc}")
 
 
+def _refresh_in_background() -> None:
+    """Refresh the cached version; on failure keep serving the stale value."""
+    global _cached_at, _refresh_in_flight
+
+    try:
+        _fetch_remote_version()
+    except Exception:
+        # Push the stale entry forward so failures are retried at a bounded rate.
+        _cached_at = time.monotonic() - CACHE_TTL_SECONDS + STALE_RETRY_INTERVAL_SECONDS
+    finally:
+        with _refresh_lock:
+            _refresh_in_flight = False
+
+
+def _start_background_refresh() -> None:
+    """Start at most one background refresh at a time."""
+    global _refresh_in_flight
+
+    with _refresh_lock:
+        if _refresh_in_flight:
+            return
+        _refresh_in_flight = True
+
+    threading.Thread(
+        target=_refresh_in_background,
+        name="fe-version-refresh",
+        daemon=True,
+    ).start()
+
+
+def get_latest_fe_version(force_refresh: bool = False) -> str:
+    """
+    Resolve the latest X-FE-Version value from chat.z.ai.
+
+    The lookup order is:
+        1. Cached value within TTL.
+        2. Expired cached value, while a background refresh runs.
+        3. Remote fetch from chat.z.ai (first call or ``force_refresh``).
+
+    Raises:
+        Exception: If unable to fetch the version from the remote source.
+    """
+    if _should_use_cache(force_refresh):
+        return _cached_version
+
+    if _cached_version and not force_refresh:
+        _start_background_refresh()
+        return _cached_version
+
+    return _fetch_remote_version()
+
+
 def refresh_fe_version() -> str:
     """Force refresh the cached version by bypassing the TTL."""
     return get_latest_fe_version(force_refresh=True)
@@ -8,7 +8,7 @@ import random
 import time
 from dataclasses import dataclass, field
 from threading import Lock
-from typing import Dict, List, Optional, Set
+from typing import Any, Dict, List, Optional, Set
 
 import httpx
 
@@ -26,6 +26,7 @@ GUEST_SESSION_TTL_JITTER_SECONDS = 60
 GUEST_SESSION_MIN_TTL_SECONDS = 180
 GUEST_POOL_MAINTENANCE_INTERVAL_SECONDS = 30
 GUEST_CLEANUP_PARALLELISM = 4
+GUEST_CREATE_PARALLELISM = 8
 CAPACITY_FILL_ATTEMPT_MULTIPLIER = 3
 CAPACITY_FILL_MIN_ATTEMPTS = 3
 MAX_DUPLICATE_LOG_USER_IDS = 3
@@ -197,6 +198,7 @@ class GuestSessionPool:
         self._capacity_lock = asyncio.Lock()
         self._background_tasks: Set[asyncio.Task] = set()
         self._cleanup_parallelism = GUEST_CLEANUP_PARALLELISM
+        self._create_parallelism = GUEST_CREATE_PARALLELISM
         self._maintenance_interval = GUEST_POOL_MAINTENANCE_INTERVAL_SECONDS
 
     async def _get_http_client(self) -> httpx.AsyncClient:
@@ -254,6 +256,19 @@ class GuestSessionPool:
 
         await asyncio.gather(*(_cleanup(session) for session in sessions))
 
+    async def _create_sessions_concurrently(self, count: int) -> List[Any]:
+        """限流并发创建匿名会话，避免大池补齐时瞬间压垮认证接口。"""
+        semaphore = asyncio.Semaphore(self._create_parallelism)
+
+        async def _create() -> GuestSession:
+            async with semaphore:
+                return await self._create_session()
+
+        return await asyncio.gather(
+            *(_create() for _ in range(count)),
+            return_exceptions=True,
+        )
+
     async def _create_session(self) -> GuestSession:
         """创建一个新的匿名访客会话。"""
         headers = _build_dynamic_headers()
@@ -415,10 +430,7 @@ class GuestSessionPool:
                     return
 
                 batch_size = min(need, attempts_left)
-                results = await asyncio.gather(
-                    *[self._create_session() for _ in range(batch_size)],
-                    return_exceptions=True,
-                )
+                results = await self._create_sessions_concurrently(batch_size)
                 attempts_left -= batch_size
 
                 created = self._register_create_results("补齐", results)
@@ -590,23 +602,23 @@ class GuestSessionPool:
         with self._lock:
             sessions = list(self._sessions.values())
 
-        valid_sessions = [
-            session for session in sessions if self._is_session_usable(session)
-        ]
-        busy_sessions = [
-            session for session in valid_sessions if session.active_requests > 0
-        ]
+        valid_count = 0
+        busy_count = 0
+        expired_count = 0
+        for session in sessions:
+            if session.is_expired:
+                expired_count += 1
+            if self._is_session_usable(session):
+                valid_count += 1
+                if session.active_requests > 0:
+                    busy_count += 1
 
         return {
             "total_sessions": len(sessions),
-            "valid_sessions": len(valid_sessions),
-            "available_sessions": len(
-                [session for session in valid_sessions if session.active_requests == 0]
-            ),
-            "busy_sessions": len(busy_sessions),
-            "expired_sessions": len(
-                [session for session in sessions if session.is_expired]
-            ),
+            "valid_sessions": valid_count,
+            "available_sessions": valid_count - busy_count,
+            "busy_sessions": busy_count,
+            "expired_sessions": expired_count,
         }
 
 
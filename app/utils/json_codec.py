@@ -0,0 +1,30 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""JSON 序列化辅助函数。"""
+
+import json
+from typing import Any
+
+import orjson
+
+
+def dumps_json_bytes(data: Any) -> bytes:
+    """优先使用 orjson 序列化；遇到其不支持的值时回退标准库。
+
+    orjson 拒绝超出 64 位范围的整数，而工具调用参数、客户端传入的 tools
+    等内容可能包含这类数值，回退后输出与 orjson 一致的紧凑 UTF-8 JSON。
+    """
+    try:
+        return orjson.dumps(data)
+    except orjson.JSONEncodeError:
+        return json.dumps(
+            data,
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+
+def dumps_json(data: Any) -> str:
+    """序列化为 JSON 字符串，规则同 ``dumps_json_bytes``。"""
+    return dumps_json_bytes(data).decode("utf-8")
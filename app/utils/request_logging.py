@@ -15,6 +15,11 @@ from app.utils.request_source import RequestSourceInfo
 
 logger = get_logger()
 
+# 首个 token 之后，只有携带这些键的帧才需要完整解析
+_OPENAI_STRUCTURAL_MARKERS = ('"usage"', '"error"')
+# 落库的错误信息长度上限，避免上游 HTML 错误页撑大日志表
+REQUEST_LOG_ERROR_MAX_CHARS = 500
+
 
 def _coerce_int(value: Any) -> int:
     try:
@@ -168,12 +173,23 @@ async def write_request_log(
             cache_creation_tokens=cache_creation_tokens,
             cache_read_tokens=cache_read_tokens,
             total_tokens=total_tokens,
-            error_message=error_message,
+            error_message=(
+                error_message[:REQUEST_LOG_ERROR_MAX_CHARS]
+                if error_message
+                else error_message
+            ),
         )
     except Exception as exc:
         logger.error(f"写入请求日志失败: {exc}")
 
 
+async def close_stream(stream: AsyncGenerator[str, None]) -> None:
+    """Close an upstream stream so an early exit releases its HTTP connection."""
+    aclose = getattr(stream, "aclose", None)
+    if aclose is not None:
+        await aclose()
+
+
 def _openai_payload_has_output(payload: Dict[str, Any]) -> bool:
     choice = ((payload.get("choices") or [{}])[0]) if isinstance(payload, dict) else {}
     delta = choice.get("delta") or {}
@@ -209,7 +225,17 @@ async def wrap_openai_stream_with_logging(
         async for chunk in stream:
             if chunk.startswith("data: "):
                 payload_text = chunk[6:].strip()
-                if payload_text and payload_text != "[DONE]":
+                if (
+                    payload_text
+                    and payload_text != "[DONE]"
+                    and (
+                        not first_token_time
+                        or any(
+                            marker in payload_text
+                            for marker in _OPENAI_STRUCTURAL_MARKERS
+                        )
+                    )
+                ):
                     try:
                         payload = json.loads(payload_text)
                     except json.JSONDecodeError:
@@ -247,6 +273,7 @@ async def wrap_openai_stream_with_logging(
         error_message = str(exc)
         raise
     finally:
+        await close_stream(stream)
         await write_request_log(
             provider=provider,
             model=model,
@@ -320,6 +347,7 @@ async def wrap_claude_stream_with_logging(
         error_message = str(exc)
         raise
     finally:
+        await close_stream(stream)
         await write_request_log(
             provider=provider,
             model=model,
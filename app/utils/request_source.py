@@ -22,6 +22,9 @@ ANTHROPIC_MODEL_ALIASES = {
     "haiku",
     "opusplan",
 }
+CLAUDE_CODE_UA_PATTERN = re.compile(r"claude-code|claude code|claude-cli|claude/")
+HTTP_CLIENT_UA_PATTERN = re.compile(r"python-httpx|httpx/|python-requests|requests/")
+_SOURCE_NAME_INVALID_CHARS = re.compile(r"[^a-zA-Z0-9._-]+")
 
 
 @dataclass(frozen=True)
@@ -36,7 +39,7 @@ class RequestSourceInfo:
 
 
 def _normalize_source_name(value: str) -> str:
-    normalized = re.sub(r"[^a-zA-Z0-9._-]+", "_", value.strip().lower())
+    normalized = _SOURCE_NAME_INVALID_CHARS.sub("_", value.strip().lower())
     return normalized.strip("_") or "unknown"
 
 
@@ -82,7 +85,7 @@ def detect_request_source(
             user_agent=user_agent,
         )
 
-    if any(token in user_agent_normalized for token in ("claude-code", "claude code", "claude-cli", "claude/")):
+    if CLAUDE_CODE_UA_PATTERN.search(user_agent_normalized):
         source = "claude_code"
         client_name = "Claude Code"
     elif "anthropic" in user_agent_normalized:
@@ -94,7 +97,7 @@ def detect_request_source(
     elif "curl/" in user_agent_normalized:
         source = "curl"
         client_name = "curl"
-    elif any(token in user_agent_normalized for token in ("python-httpx", "httpx/", "python-requests", "requests/")):
+    elif HTTP_CLIENT_UA_PATTERN.search(user_agent_normalized):
         source = "custom_http_client"
         client_name = "HTTP Client"
     elif "mozilla/" in user_agent_normalized:
@@ -21,6 +21,8 @@ import httpx
 
 from app.utils.logger import logger
 
+TOKEN_HEALTH_CHECK_PARALLELISM = 8
+
 
 # ==================== Token 状态管理 ====================
 
@@ -111,12 +113,17 @@ class ZAITokenValidator:
         }
 
     @classmethod
-    async def validate_token(cls, token: str) -> Tuple[str, bool, Optional[str]]:
+    async def validate_token(
+        cls,
+        token: str,
+        client: Optional[httpx.AsyncClient] = None,
+    ) -> Tuple[str, bool, Optional[str]]:
         """
         验证 Token 有效性并返回类型
 
         Args:
             token: 待验证的 Token
+            client: 可选的共享 HTTP 客户端；批量验证时复用连接，未提供时临时创建
 
         Returns:
             (token_type, is_valid, error_message)
@@ -125,14 +132,20 @@ class ZAITokenValidator:
             - error_message: 失败原因（仅在 is_valid=False 时有值）
         """
         try:
-            async with httpx.AsyncClient(timeout=15.0) as client:
+            if client is None:
+                async with httpx.AsyncClient(timeout=15.0) as own_client:
+                    response = await own_client.get(
+                        cls.AUTH_URL,
+                        headers=cls.get_headers(token)
+                    )
+            else:
                 response = await client.get(
                     cls.AUTH_URL,
                     headers=cls.get_headers(token)
                 )
 
-                # 解析响应
-                return cls._parse_auth_response(response)
+            # 解析响应
+            return cls._parse_auth_response(response)
 
         except httpx.TimeoutException:
             return ("unknown", False, "请求超时")
@@ -390,30 +403,22 @@ class TokenPool:
     def get_pool_status(self) -> Dict:
         """获取 Token 池状态信息"""
         with self._lock:
-            available_count = len(self._get_available_user_tokens())
-            total_count = len(self.token_statuses)
-            healthy_count = sum(1 for status in self.token_statuses.values() if status.is_healthy)
-
-            # 统计各类型 Token
-            user_count = sum(1 for s in self.token_statuses.values() if s.token_type == "user")
-            guest_count = sum(1 for s in self.token_statuses.values() if s.token_type == "guest")
-            unknown_count = sum(1 for s in self.token_statuses.values() if s.token_type == "unknown")
-
-            status_info = {
-                "total_tokens": total_count,
-                "available_tokens": available_count,
-                "unavailable_tokens": total_count - available_count,
-                "healthy_tokens": healthy_count,
-                "unhealthy_tokens": total_count - healthy_count,
-                "user_tokens": user_count,
-                "guest_tokens": guest_count,
-                "unknown_tokens": unknown_count,
-                "current_index": self._current_index,
-                "tokens": []
-            }
+            # 单次遍历同时完成计数与明细构建
+            type_counts: Dict[str, int] = {"user": 0, "guest": 0, "unknown": 0}
+            available_count = 0
+            healthy_count = 0
+            tokens_info: List[Dict] = []
 
             for token, status in self.token_statuses.items():
-                status_info["tokens"].append({
+                token_type = status.token_type
+                type_counts[token_type] = type_counts.get(token_type, 0) + 1
+                if status.is_available and status.token_type == "user":
+                    available_count += 1
+                is_healthy = status.is_healthy
+                if is_healthy:
+                    healthy_count += 1
+
+                tokens_info.append({
                     "token": f"{token[:10]}...{token[-10:]}",
                     "token_id": status.token_id,
                     "token_type": status.token_type,
@@ -422,11 +427,25 @@ class TokenPool:
                     "success_count": status.successful_requests,
                     "success_rate": f"{status.success_rate:.2%}",
                     "total_requests": status.total_requests,
-                    "is_healthy": status.is_healthy,
+                    "is_healthy": is_healthy,
                     "last_failure_time": status.last_failure_time,
                     "last_success_time": status.last_success_time
                 })
 
+            total_count = len(self.token_statuses)
+            status_info = {
+                "total_tokens": total_count,
+                "available_tokens": available_count,
+                "unavailable_tokens": total_count - available_count,
+                "healthy_tokens": healthy_count,
+                "unhealthy_tokens": total_count - healthy_count,
+                "user_tokens": type_counts["user"],
+                "guest_tokens": type_counts["guest"],
+                "unknown_tokens": type_counts["unknown"],
+                "current_index": self._current_index,
+                "tokens": tokens_info
+            }
+
             return status_info
 
     def update_token_type(self, token: str, token_type: str):
@@ -439,17 +458,25 @@ class TokenPool:
                 if old_type != token_type:
                     logger.info(f"🔄 更新 Token 类型: {token[:20]}... {old_type} → {token_type}")
 
-    async def health_check_token(self, token: str) -> bool:
+    async def health_check_token(
+        self,
+        token: str,
+        client: Optional[httpx.AsyncClient] = None,
+    ) -> bool:
         """
         异步健康检查单个 Token（使用 Z.AI 官方认证接口）
 
         Args:
             token: 要检查的 Token
+            client: 可选的共享 HTTP 客户端
 
         Returns:
             Token 是否健康（True = 有效的认证用户 Token）
         """
-        token_type, is_valid, error_message = await ZAITokenValidator.validate_token(token)
+        token_type, is_valid, error_message = await ZAITokenValidator.validate_token(
+            token,
+            client=client,
+        )
 
         # 更新 Token 类型
         self.update_token_type(token, token_type)
@@ -474,13 +501,21 @@ class TokenPool:
         total_tokens = len(self.token_statuses)
         logger.info(f"🔍 开始 Token 池健康检查... (共 {total_tokens} 个 Token)")
 
-        # 并发执行所有 Token 的健康检查
-        tasks = [
-            self.health_check_token(token)
-            for token in self.token_statuses.keys()
-        ]
+        # 有界并发执行所有 Token 的健康检查，共用一个客户端以复用连接，
+        # 避免 Token 较多时瞬间打满上游认证接口
+        semaphore = asyncio.Semaphore(TOKEN_HEALTH_CHECK_PARALLELISM)
+
+        async def _check(token: str, client: httpx.AsyncClient) -> bool:
+            async with semaphore:
+                return await self.health_check_token(token, client=client)
+
+        async with httpx.AsyncClient(timeout=15.0) as client:
+            tasks = [
+                _check(token, client)
+                for token in list(self.token_statuses.keys())
+            ]
 
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+            results = await asyncio.gather(*tasks, return_exceptions=True)
 
         # 统计结果
         healthy_count = sum(1 for r in results if r is True)
@@ -7,9 +7,13 @@
 """
 
 import random
+import re
 from typing import Dict, Optional
 from fake_useragent import UserAgent
 
+CHROME_VERSION_PATTERN = re.compile(r"Chrome/(\d+)")
+EDGE_VERSION_PATTERN = re.compile(r"Edg/(\d+)")
+
 # 全局 UserAgent 实例（单例模式）
 _user_agent_instance: Optional[UserAgent] = None
 
@@ -97,23 +101,21 @@ def get_dynamic_headers(
     # 根据用户代理添加浏览器特定的 headers
     if "Chrome/" in user_agent or "Edg/" in user_agent:
         # Chrome/Edge 特定的 headers
-        chrome_version = "139"
-        edge_version = "139"
-
-        try:
-            if "Chrome/" in user_agent:
-                chrome_version = user_agent.split("Chrome/")[1].split(".")[0]
-        except:
-            pass
-
-        try:
-            if "Edg/" in user_agent:
-                edge_version = user_agent.split("Edg/")[1].split(".")[0]
-                sec_ch_ua = f'"Microsoft Edge";v="{edge_version}", "Chromium";v="{chrome_version}", "Not_A Brand";v="24"'
-            else:
-                sec_ch_ua = f'"Not_A Brand";v="8", "Chromium";v="{chrome_version}", "Google Chrome";v="{chrome_version}"'
-        except:
-            sec_ch_ua = f'"Not_A Brand";v="8", "Chromium";v="{chrome_version}", "Google Chrome";v="{chrome_version}"'
+        chrome_match = CHROME_VERSION_PATTERN.search(user_agent)
+        chrome_version = chrome_match.group(1) if chrome_match else "139"
+
+        edge_match = EDGE_VERSION_PATTERN.search(user_agent)
+        if edge_match:
+            edge_version = edge_match.group(1)
+            sec_ch_ua = (
+                f'"Microsoft Edge";v="{edge_version}", '
+                f'"Chromium";v="{chrome_version}", "Not_A Brand";v="24"'
+            )
+        else:
+            sec_ch_ua = (
+                f'"Not_A Brand";v="8", "Chromium";v="{chrome_version}", '
+                f'"Google Chrome";v="{chrome_version}"'
+            )
 
         headers.update({
             "sec-ch-ua": sec_ch_ua,
@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import asyncio
 import os
 import sys
 from contextlib import asynccontextmanager
@@ -14,7 +15,7 @@ from app.admin import api as admin_api
 from app.admin import routes as admin_routes
 from app.core import claude, openai
 from app.core.config import settings
-from app.core.upstream import UpstreamClient
+from app.utils.fe_version import get_latest_fe_version
 from app.utils.logger import setup_logger
 from app.utils.reload_config import RELOAD_CONFIG
 
@@ -25,7 +26,7 @@ logger = setup_logger(log_dir="logs", debug_mode=settings.DEBUG_LOGGING)
 async def warmup_upstream_client():
     """可选预热上游适配器，提前初始化动态依赖。"""
     try:
-        client = UpstreamClient()
+        client = openai.get_upstream_client()
         logger.info(
             f"✅ 上游适配器已就绪，支持 {len(client.get_supported_models())} 个模型"
         )
@@ -44,35 +45,45 @@ async def lifespan(app: FastAPI):
     )
     from app.services.token_dao import init_token_database
 
-    await init_token_database()
-    init_request_log_dao()
+    # 在后台线程预取前端版本号，与数据库初始化并行，避免首个请求阻塞事件循环
+    fe_version_warmup = asyncio.create_task(asyncio.to_thread(get_latest_fe_version))
 
-    if (
-        settings.TOKEN_AUTO_IMPORT_ENABLED
-        and settings.TOKEN_AUTO_IMPORT_SOURCE_DIR.strip()
-    ):
-        try:
-            await run_directory_import(
-                settings.TOKEN_AUTO_IMPORT_SOURCE_DIR,
-                provider="zai",
+    # 预取线程无法取消，即使中间步骤抛错也要等它结束，避免遗留未回收的任务
+    try:
+        await init_token_database()
+        init_request_log_dao()
+
+        if (
+            settings.TOKEN_AUTO_IMPORT_ENABLED
+            and settings.TOKEN_AUTO_IMPORT_SOURCE_DIR.strip()
+        ):
+            try:
+                await run_directory_import(
+                    settings.TOKEN_AUTO_IMPORT_SOURCE_DIR,
+                    provider="zai",
+                )
+                logger.info("✅ 启动阶段已完成一次目录自动导入")
+            except Exception as exc:
+                logger.warning(f"⚠️ 启动阶段目录自动导入失败: {exc}")
+
+        # 从数据库初始化认证 token 池
+        from app.utils.token_pool import initialize_token_pool_from_db
+
+        token_pool = await initialize_token_pool_from_db(
+            provider="zai",
+            failure_threshold=settings.TOKEN_FAILURE_THRESHOLD,
+            recovery_timeout=settings.TOKEN_RECOVERY_TIMEOUT,
+        )
+
+        if not token_pool and not settings.ANONYMOUS_MODE:
+            logger.warning(
+                "⚠️ 未找到可用 Token 且未启用匿名模式，服务可能无法正常工作"
             )
-            logger.info("✅ 启动阶段已完成一次目录自动导入")
+    finally:
+        try:
+            await fe_version_warmup
         except Exception as exc:
-            logger.warning(f"⚠️ 启动阶段目录自动导入失败: {exc}")
-
-    # 从数据库初始化认证 token 池
-    from app.utils.token_pool import initialize_token_pool_from_db
-
-    token_pool = await initialize_token_pool_from_db(
-        provider="zai",
-        failure_threshold=settings.TOKEN_FAILURE_THRESHOLD,
-        recovery_timeout=settings.TOKEN_RECOVERY_TIMEOUT,
-    )
-
-    if not token_pool and not settings.ANONYMOUS_MODE:
-        logger.warning(
-            "⚠️ 未找到可用 Token 且未启用匿名模式，服务可能无法正常工作"
-        )
+            logger.warning(f"⚠️ 前端版本号预取失败，将在首次请求时重试: {exc}")
 
     if settings.ANONYMOUS_MODE:
         from app.utils.guest_session_pool import initialize_guest_session_pool
@@ -94,6 +105,7 @@ async def lifespan(app: FastAPI):
     logger.info("🔄 应用正在关闭...")
 
     await stop_token_automation_scheduler()
+    await openai.get_upstream_client().close()
 
     if settings.ANONYMOUS_MODE:
         from app.utils.guest_session_pool import close_guest_session_pool
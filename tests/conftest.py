@@ -0,0 +1,35 @@
+import asyncio
+
+import pytest
+
+try:
+    import uvloop
+except ImportError:  # uvloop 不支持 Windows，缺失时沿用默认事件循环
+    uvloop = None
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    """仅为 pytest-asyncio 管理的事件循环启用 uvloop，不改动进程全局策略。"""
+    if uvloop is not None:
+        return uvloop.EventLoopPolicy()
+    return asyncio.DefaultEventLoopPolicy()
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-network",
+        action="store_true",
+        default=False,
+        help="运行需要访问真实上游的 network 测试",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-network"):
+        return
+
+    skip_network = pytest.mark.skip(reason="需要 --run-network 才会访问真实上游")
+    for item in items:
+        if "network" in item.keywords:
+            item.add_marker(skip_network)
@@ -7,6 +7,10 @@ from app.core import upstream as upstream_module
 from app.core.upstream import UpstreamClient, _extract_user_id_from_token
 
 REAL_AUTH_TOKEN_ENV = "REAL_AUTH_TOKEN_ENV"
+requires_real_auth = pytest.mark.skipif(
+    not os.getenv(REAL_AUTH_TOKEN_ENV, "").strip(),
+    reason=f"需要设置环境变量 {REAL_AUTH_TOKEN_ENV}",
+)
 RED_2X2_PNG_DATA_URL = (
     "data:image/png;base64,"
     "iVBORw0KGgoAAAANSUhEUgAAAAIAAAACCAIAAAD91JpzAAAAEElEQVR42mP4z8AARAwQCgAf7gP9Y167WwAAAABJRU5ErkJggg=="
@@ -14,9 +18,6 @@ RED_2X2_PNG_DATA_URL = (
 
 def install_real_auth(monkeypatch) -> str:
     token = os.getenv(REAL_AUTH_TOKEN_ENV, "").strip()
-    if not token:
-        pytest.skip(f"需要设置环境变量 {REAL_AUTH_TOKEN_ENV}")
-
     user_id = _extract_user_id_from_token(token)
     if not user_id or user_id == "guest":
         raise AssertionError(f"{REAL_AUTH_TOKEN_ENV} 不是可解析的认证 token")
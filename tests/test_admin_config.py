@@ -1,3 +1,5 @@
+import asyncio
+import time
 from types import SimpleNamespace
 from urllib.parse import urlencode
 
@@ -8,6 +10,7 @@ from starlette.requests import Request
 from app.admin import api as admin_api
 from app.admin.config_manager import (
     CONFIG_FIELD_SPECS,
+    _apply_env_change,
     build_config_page_data,
     save_form_config,
     save_source_config,
@@ -167,6 +170,80 @@ async def test_save_source_config_rolls_back_file_when_reload_fails(tmp_path):
     assert env_path.read_text(encoding="utf-8") == "SERVICE_NAME=old-service\n"
 
 
+@pytest.mark.asyncio
+async def test_save_source_config_replaces_file_atomically(tmp_path):
+    env_path = tmp_path / ".env"
+    env_path.write_text("SERVICE_NAME=old-service\n", encoding="utf-8")
+    env_path.chmod(0o640)
+
+    async def fake_reload():
+        return None
+
+    await save_source_config(
+        "SERVICE_NAME=new-service\n",
+        reload_callback=fake_reload,
+        env_path=env_path,
+    )
+
+    assert env_path.read_text(encoding="utf-8") == "SERVICE_NAME=new-service\n"
+    assert env_path.stat().st_mode & 0o777 == 0o640
+    assert [path.name for path in tmp_path.iterdir()] == [".env"]
+
+
+@pytest.mark.asyncio
+async def test_save_source_config_keeps_symlinked_env_file(tmp_path):
+    real_path = tmp_path / "config.env"
+    real_path.write_text("SERVICE_NAME=old-service\n", encoding="utf-8")
+    env_path = tmp_path / ".env"
+    env_path.symlink_to(real_path)
+
+    async def fake_reload():
+        return None
+
+    await save_source_config(
+        "SERVICE_NAME=new-service\n",
+        reload_callback=fake_reload,
+        env_path=env_path,
+    )
+
+    assert env_path.is_symlink()
+    assert real_path.read_text(encoding="utf-8") == "SERVICE_NAME=new-service\n"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_env_changes_do_not_lose_updates(tmp_path):
+    env_path = tmp_path / ".env"
+    env_path.write_text("SERVICE_NAME=old-service\n", encoding="utf-8")
+
+    async def fake_reload():
+        return None
+
+    def build_writer(line: str):
+        def _writer(target_path):
+            content = target_path.read_text(encoding="utf-8")
+            time.sleep(0.05)
+            target_path.write_text(f"{content}{line}\n", encoding="utf-8")
+
+        return _writer
+
+    await asyncio.gather(
+        _apply_env_change(
+            build_writer("FIRST=1"),
+            reload_callback=fake_reload,
+            env_path=env_path,
+        ),
+        _apply_env_change(
+            build_writer("SECOND=2"),
+            reload_callback=fake_reload,
+            env_path=env_path,
+        ),
+    )
+
+    content = env_path.read_text(encoding="utf-8")
+    assert "FIRST=1" in content
+    assert "SECOND=2" in content
+
+
 @pytest.mark.asyncio
 async def test_save_config_endpoint_returns_refresh_trigger(tmp_path, monkeypatch):
     monkeypatch.chdir(tmp_path)
@@ -0,0 +1,35 @@
+import pytest
+
+from app.core import claude as claude_module
+from app.core.claude import _resolve_claude_model
+
+
+@pytest.mark.parametrize(
+    ("requested", "setting_name"),
+    [
+        ("GLM-4.7", "GLM47_MODEL"),
+        ("glm-4.5-air", "GLM45_AIR_MODEL"),
+        ("sonnet", "GLM5_MODEL"),
+        ("haiku", "GLM45_AIR_MODEL"),
+        ("opusplan", "GLM47_THINKING_MODEL"),
+        ("claude-sonnet-4-5[1m]", "GLM5_MODEL"),
+        ("claude-3-5-haiku-20241022", "GLM45_AIR_MODEL"),
+        ("", "GLM5_MODEL"),
+    ],
+)
+def test_resolve_claude_model_maps_aliases(requested, setting_name):
+    assert _resolve_claude_model(requested) == getattr(
+        claude_module.settings,
+        setting_name,
+    )
+
+
+def test_resolve_claude_model_passes_unknown_models_through():
+    assert _resolve_claude_model(" custom-model ") == "custom-model"
+
+
+def test_resolve_claude_model_follows_settings_reload(monkeypatch):
+    monkeypatch.setattr(claude_module.settings, "GLM5_MODEL", "GLM-5-Reloaded")
+
+    assert _resolve_claude_model("glm-5-reloaded") == "GLM-5-Reloaded"
+    assert _resolve_claude_model("sonnet") == "GLM-5-Reloaded"
@@ -1,14 +1,26 @@
 from pathlib import Path
 
-
-ROOT = Path(__file__).resolve().parents[1]
+import pytest
 
 
-def test_requirements_enable_httpx_socks_support():
-    requirements = (ROOT / "requirements.txt").read_text(encoding="utf-8")
-    assert "httpx[http2,socks]==0.28.1" in requirements
+ROOT = Path(__file__).resolve().parents[1]
 
 
-def test_pyproject_enable_httpx_socks_support():
-    pyproject = (ROOT / "pyproject.toml").read_text(encoding="utf-8")
-    assert '"httpx[http2,socks]==0.28.1"' in pyproject
+@pytest.mark.parametrize(
+    ("filename", "expected_pin"),
+    [
+        ("requirements.txt", "httpx[http2,socks]==0.28.1"),
+        ("pyproject.toml", '"httpx[http2,socks]==0.28.1"'),
+        ("requirements.txt", "granian[reload,pname,uvloop]==2.5.2"),
+        ("pyproject.toml", '"granian[reload,pname,uvloop]==2.5.2"'),
+    ],
+    ids=[
+        "requirements-httpx-socks",
+        "pyproject-httpx-socks",
+        "requirements-granian-uvloop",
+        "pyproject-granian-uvloop",
+    ],
+)
+def test_dependency_pins(filename, expected_pin):
+    content = (ROOT / filename).read_text(encoding="utf-8")
+    assert expected_pin in content
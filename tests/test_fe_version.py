@@ -0,0 +1,46 @@
+import time
+
+from app.utils import fe_version as fe_version_module
+
+
+def _expire_cache(monkeypatch, version: str) -> None:
+    monkeypatch.setattr(fe_version_module, "_cached_version", version)
+    monkeypatch.setattr(
+        fe_version_module,
+        "_cached_at",
+        time.monotonic() - fe_version_module.CACHE_TTL_SECONDS - 1,
+    )
+
+
+def test_expired_version_is_served_while_refreshing_in_background(monkeypatch):
+    refreshes: list[str] = []
+    _expire_cache(monkeypatch, "prod-fe-1.0.1")
+    monkeypatch.setattr(
+        fe_version_module,
+        "_start_background_refresh",
+        lambda: refreshes.append("started"),
+    )
+
+    def fail_fetch():
+        raise AssertionError("过期缓存不应阻塞在远程拉取上")
+
+    monkeypatch.setattr(fe_version_module, "_fetch_remote_version", fail_fetch)
+
+    assert fe_version_module.get_latest_fe_version() == "prod-fe-1.0.1"
+    assert refreshes == ["started"]
+
+
+def test_failed_background_refresh_keeps_stale_version(monkeypatch):
+    _expire_cache(monkeypatch, "prod-fe-1.0.1")
+    monkeypatch.setattr(fe_version_module, "_refresh_in_flight", True)
+
+    def fail_fetch():
+        raise Exception("offline")
+
+    monkeypatch.setattr(fe_version_module, "_fetch_remote_version", fail_fetch)
+
+    fe_version_module._refresh_in_background()
+
+    assert fe_version_module._refresh_in_flight is False
+    assert fe_version_module._should_use_cache(force_refresh=False) is True
+    assert fe_version_module.get_latest_fe_version() == "prod-fe-1.0.1"
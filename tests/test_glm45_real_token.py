@@ -9,6 +9,8 @@ from tests.real_upstream_test_utils import (
     install_real_anonymous,
 )
 
+pytestmark = pytest.mark.network
+
 
 @pytest.mark.asyncio
 async def test_glm45_with_real_anonymous_request(monkeypatch):
@@ -8,8 +8,11 @@ from tests.real_upstream_test_utils import (
     assert_usage_present,
     extract_content,
     install_real_auth,
+    requires_real_auth,
 )
 
+pytestmark = [pytest.mark.network, requires_real_auth]
+
 
 @pytest.mark.asyncio
 async def test_glm46v_with_real_auth_token_and_image(monkeypatch):
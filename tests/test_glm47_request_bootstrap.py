@@ -1,3 +1,4 @@
+import asyncio
 from urllib.parse import parse_qs, urlparse
 
 import pytest
@@ -22,13 +23,25 @@ FAKE_HEADERS = {
     "Referer": "https://chat.z.ai/",
 }
 
+GREETING_MESSAGES = [Message(role="user", content="请用一句话回答：你好")]
 
-def _make_request(model: str) -> OpenAIRequest:
-    return OpenAIRequest(
-        model=model,
-        messages=[Message(role="user", content="请用一句话回答：你好")],
-        stream=True,
-    )
+
+def _make_request(model: str, **overrides) -> OpenAIRequest:
+    fields = {"model": model, "messages": GREETING_MESSAGES, "stream": True}
+    fields.update(overrides)
+    return OpenAIRequest(**fields)
+
+
+def _build_fake_headers(browser_type_calls: list | None = None):
+    def fake_headers(chat_id: str = "", browser_type=None):
+        if browser_type_calls is not None:
+            browser_type_calls.append(browser_type)
+        headers = dict(FAKE_HEADERS)
+        if chat_id:
+            headers["Referer"] = f"https://chat.z.ai/c/{chat_id}"
+        return headers
+
+    return fake_headers
 
 
 async def _fake_get_auth_info(self, excluded_tokens=None, excluded_guest_user_ids=None):
@@ -47,16 +60,6 @@ async def test_glm47_request_bootstraps_chat_and_uses_browser_signature(monkeypa
     create_chat_calls: list[dict] = []
     browser_type_calls: list[str | None] = []
 
-    def fake_headers(chat_id: str = "", browser_type=None):
-        browser_type_calls.append(browser_type)
-        headers = dict(FAKE_HEADERS)
-        headers["Referer"] = (
-            f"https://chat.z.ai/c/{chat_id}"
-            if chat_id
-            else FAKE_HEADERS["Referer"]
-        )
-        return headers
-
     async def fake_create_chat(
         self,
         *,
@@ -89,7 +92,11 @@ async def test_glm47_request_bootstraps_chat_and_uses_browser_signature(monkeypa
 
     monkeypatch.setattr(UpstreamClient, "get_auth_info", _fake_get_auth_info)
     monkeypatch.setattr(UpstreamClient, "_create_upstream_chat", fake_create_chat)
-    monkeypatch.setattr(upstream_module, "get_dynamic_headers", fake_headers)
+    monkeypatch.setattr(
+        upstream_module,
+        "get_dynamic_headers",
+        _build_fake_headers(browser_type_calls),
+    )
 
     client = UpstreamClient()
     transformed = await client.transform_request(_make_request("GLM-4.7"))
@@ -132,15 +139,6 @@ async def test_glm47_request_bootstraps_chat_and_uses_browser_signature(monkeypa
 async def test_glm47_thinking_defaults_to_enable_thinking(monkeypatch):
     create_chat_calls: list[dict] = []
 
-    def fake_headers(chat_id: str = "", browser_type=None):
-        headers = dict(FAKE_HEADERS)
-        headers["Referer"] = (
-            f"https://chat.z.ai/c/{chat_id}"
-            if chat_id
-            else FAKE_HEADERS["Referer"]
-        )
-        return headers
-
     async def fake_create_chat(
         self,
         *,
@@ -170,7 +168,7 @@ async def test_glm47_thinking_defaults_to_enable_thinking(monkeypatch):
 
     monkeypatch.setattr(UpstreamClient, "get_auth_info", _fake_get_auth_info)
     monkeypatch.setattr(UpstreamClient, "_create_upstream_chat", fake_create_chat)
-    monkeypatch.setattr(upstream_module, "get_dynamic_headers", fake_headers)
+    monkeypatch.setattr(upstream_module, "get_dynamic_headers", _build_fake_headers())
 
     client = UpstreamClient()
     transformed = await client.transform_request(_make_request("GLM-4.7-Thinking"))
@@ -191,21 +189,12 @@ async def test_glm47_thinking_defaults_to_enable_thinking(monkeypatch):
 
 @pytest.mark.asyncio
 async def test_non_glm47_request_keeps_legacy_request_shape(monkeypatch):
-    def fake_headers(chat_id: str = "", browser_type=None):
-        headers = dict(FAKE_HEADERS)
-        headers["Referer"] = (
-            f"https://chat.z.ai/c/{chat_id}"
-            if chat_id
-            else FAKE_HEADERS["Referer"]
-        )
-        return headers
-
     async def fail_create_chat(self, **kwargs):
         raise AssertionError("GLM-4.5 不应触发 create_chat")
 
     monkeypatch.setattr(UpstreamClient, "get_auth_info", _fake_get_auth_info)
     monkeypatch.setattr(UpstreamClient, "_create_upstream_chat", fail_create_chat)
-    monkeypatch.setattr(upstream_module, "get_dynamic_headers", fake_headers)
+    monkeypatch.setattr(upstream_module, "get_dynamic_headers", _build_fake_headers())
 
     client = UpstreamClient()
     transformed = await client.transform_request(_make_request("GLM-4.5"))
@@ -218,83 +207,40 @@ async def test_non_glm47_request_keeps_legacy_request_shape(monkeypatch):
     assert transformed["body"]["model_item"]["name"] == "GLM-4.5"
 
 
+@pytest.mark.parametrize(
+    ("enable_thinking", "expected_thinking"),
+    [(None, True), (False, False), (True, True)],
+    ids=["default", "disabled", "enabled"],
+)
 @pytest.mark.asyncio
-async def test_glm5_defaults_to_enable_thinking(monkeypatch):
-    def fake_headers(chat_id: str = "", browser_type=None):
-        headers = dict(FAKE_HEADERS)
-        headers["Referer"] = (
-            f"https://chat.z.ai/c/{chat_id}"
-            if chat_id
-            else FAKE_HEADERS["Referer"]
-        )
-        return headers
-
+async def test_glm5_enable_thinking(monkeypatch, enable_thinking, expected_thinking):
     async def fail_create_chat(self, **kwargs):
         raise AssertionError("GLM-5 不应触发 create_chat")
 
     monkeypatch.setattr(UpstreamClient, "get_auth_info", _fake_get_auth_info)
     monkeypatch.setattr(UpstreamClient, "_create_upstream_chat", fail_create_chat)
-    monkeypatch.setattr(upstream_module, "get_dynamic_headers", fake_headers)
+    monkeypatch.setattr(upstream_module, "get_dynamic_headers", _build_fake_headers())
 
     client = UpstreamClient()
-    transformed = await client.transform_request(_make_request("GLM-5"))
+    transformed = await client.transform_request(
+        _make_request("GLM-5", enable_thinking=enable_thinking)
+    )
     query = parse_qs(urlparse(transformed["url"]).query)
 
     assert transformed["headers"]["Accept"] == "application/json"
     assert transformed["body"]["model"] == "glm-5"
-    assert transformed["body"]["features"]["enable_thinking"] is True
+    assert transformed["body"]["features"]["enable_thinking"] is expected_thinking
     assert transformed["body"]["features"]["preview_mode"] is True
     assert "session_id" in transformed["body"]
     assert "user_agent" not in query
 
 
-@pytest.mark.asyncio
-async def test_glm5_allows_explicitly_disabling_thinking(monkeypatch):
-    def fake_headers(chat_id: str = "", browser_type=None):
-        headers = dict(FAKE_HEADERS)
-        headers["Referer"] = (
-            f"https://chat.z.ai/c/{chat_id}"
-            if chat_id
-            else FAKE_HEADERS["Referer"]
-        )
-        return headers
-
-    async def fail_create_chat(self, **kwargs):
-        raise AssertionError("GLM-5 不应触发 create_chat")
-
-    monkeypatch.setattr(UpstreamClient, "get_auth_info", _fake_get_auth_info)
-    monkeypatch.setattr(UpstreamClient, "_create_upstream_chat", fail_create_chat)
-    monkeypatch.setattr(upstream_module, "get_dynamic_headers", fake_headers)
-
-    client = UpstreamClient()
-    request = OpenAIRequest(
-        model="GLM-5",
-        messages=[Message(role="user", content="请用一句话回答：你好")],
-        stream=False,
-        enable_thinking=False,
-    )
-
-    transformed = await client.transform_request(request)
-
-    assert transformed["body"]["features"]["enable_thinking"] is False
-
-
 @pytest.mark.asyncio
 async def test_glm46v_uses_persisted_chat_and_visual_features(monkeypatch):
     create_chat_calls: list[dict] = []
     upload_calls: list[dict] = []
     browser_type_calls: list[str | None] = []
 
-    def fake_headers(chat_id: str = "", browser_type=None):
-        browser_type_calls.append(browser_type)
-        headers = dict(FAKE_HEADERS)
-        headers["Referer"] = (
-            f"https://chat.z.ai/c/{chat_id}"
-            if chat_id
-            else FAKE_HEADERS["Referer"]
-        )
-        return headers
-
     async def fake_create_chat(
         self,
         *,
@@ -371,11 +317,15 @@ async def test_glm46v_uses_persisted_chat_and_visual_features(monkeypatch):
     monkeypatch.setattr(UpstreamClient, "get_auth_info", _fake_get_auth_info)
     monkeypatch.setattr(UpstreamClient, "_create_upstream_chat", fake_create_chat)
     monkeypatch.setattr(UpstreamClient, "upload_image", fake_upload_image)
-    monkeypatch.setattr(upstream_module, "get_dynamic_headers", fake_headers)
+    monkeypatch.setattr(
+        upstream_module,
+        "get_dynamic_headers",
+        _build_fake_headers(browser_type_calls),
+    )
 
     client = UpstreamClient()
-    request = OpenAIRequest(
-        model="GLM-4.6V",
+    request = _make_request(
+        "GLM-4.6V",
         messages=[
             Message(
                 role="user",
@@ -442,3 +392,82 @@ async def test_glm46v_uses_persisted_chat_and_visual_features(monkeypatch):
         "file-id"
     )
     assert "session_id" not in transformed["body"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("parallelism", "expected_peak"),
+    [(4, 3), (2, 2)],
+    ids=["all-at-once", "bounded"],
+)
+async def test_base64_images_upload_concurrently_and_keep_order(
+    monkeypatch,
+    parallelism,
+    expected_peak,
+):
+    state = {"active": 0, "peak": 0}
+
+    async def fake_upload_image(
+        self,
+        data_url,
+        chat_id,
+        token,
+        user_id,
+        auth_mode="authenticated",
+    ):
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        index = int(data_url.rsplit(",", 1)[1])
+        await asyncio.sleep(0.01 * (3 - index))
+        state["active"] -= 1
+        if index == 1:
+            return None
+        return {"id": f"file-{index}"}
+
+    monkeypatch.setattr(UpstreamClient, "get_auth_info", _fake_get_auth_info)
+    monkeypatch.setattr(UpstreamClient, "upload_image", fake_upload_image)
+    monkeypatch.setattr(upstream_module, "get_dynamic_headers", _build_fake_headers())
+    monkeypatch.setattr(upstream_module, "IMAGE_UPLOAD_PARALLELISM", parallelism)
+
+    request = _make_request(
+        "GLM-4.5",
+        messages=[
+            Message(
+                role="user",
+                content=[
+                    ContentPart(type="text", text="比较这些图片"),
+                    *(
+                        ContentPart(
+                            type="image_url",
+                            image_url=ImageUrl(url=f"data:image/png;base64,{index}"),
+                        )
+                        for index in range(3)
+                    ),
+                ],
+            )
+        ],
+        stream=False,
+    )
+
+    transformed = await UpstreamClient().transform_request(request)
+
+    assert state["peak"] == expected_peak
+    assert [item["id"] for item in transformed["body"]["files"]] == [
+        "file-0",
+        "file-2",
+    ]
+    assert transformed["body"]["messages"][0]["content"] == [
+        {"type": "text", "text": "比较这些图片 [系统提示: 图片上传失败]"},
+        {"type": "image_url", "image_url": {"url": "file-0"}},
+        {"type": "image_url", "image_url": {"url": "file-2"}},
+    ]
+
+
+@pytest.mark.parametrize("upstream_model_id", ["glm-4.6v", "glm-5", "unknown-model"])
+def test_model_request_profiles_are_read_only(upstream_model_id):
+    profile = UpstreamClient()._get_model_request_profile(upstream_model_id)
+
+    with pytest.raises(TypeError):
+        profile["mcp_servers"] = ("injected",)
+
+    assert "injected" not in profile["mcp_servers"]
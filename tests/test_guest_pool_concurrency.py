@@ -3,6 +3,7 @@ import types
 from dataclasses import dataclass, field
 from unittest.mock import AsyncMock
 
+import orjson
 import pytest
 
 from app.core import upstream as upstream_module
@@ -26,7 +27,8 @@ def _make_session(user_id: str, token_suffix: str) -> GuestSession:
     )
 
 
-def _make_request() -> OpenAIRequest:
+@pytest.fixture(scope="module")
+def ping_request() -> OpenAIRequest:
     return OpenAIRequest(
         model="GLM-4.5",
         messages=[Message(role="user", content="ping")],
@@ -53,8 +55,10 @@ class FakeResponse:
 
 def _build_fake_async_client(handler):
     class FakeAsyncClient:
+        instance_count = 0
+
         def __init__(self, *args, **kwargs):
-            pass
+            type(self).instance_count += 1
 
         async def __aenter__(self):
             return self
@@ -62,8 +66,8 @@ def _build_fake_async_client(handler):
         async def __aexit__(self, exc_type, exc, tb):
             return False
 
-        async def post(self, url, headers=None, json=None):
-            return await handler(url, headers or {}, json or {})
+        async def post(self, url, headers=None, content=None):
+            return await handler(url, headers or {}, orjson.loads(content))
 
     return FakeAsyncClient
 
@@ -157,26 +161,25 @@ def _build_handler(
 
 
 @pytest.mark.asyncio
-async def test_guest_pool_handles_many_concurrent_requests(monkeypatch):
+async def test_guest_pool_handles_many_concurrent_requests(monkeypatch, ping_request):
     pool = await _build_pool(monkeypatch, POOL_SIZE)
     assigned_user_ids: list[str] = []
     state = LoadState()
     client = UpstreamClient()
     handler = _build_handler(REQUEST_DELAY_SECONDS, state)
 
+    async_client_cls = _build_fake_async_client(handler)
+
     _bind_guest_request_flow(client, pool, assigned_user_ids)
-    _patch_upstream_globals(
-        monkeypatch,
-        pool,
-        _build_fake_async_client(handler),
-    )
+    _patch_upstream_globals(monkeypatch, pool, async_client_cls)
 
     results = await asyncio.gather(
-        *(client.chat_completion(_make_request()) for _ in range(REQUEST_COUNT))
+        *(client.chat_completion(ping_request) for _ in range(REQUEST_COUNT))
     )
     pool_status = pool.get_pool_status()
 
     assert all(result.get("ok") is True for result in results)
+    assert async_client_cls.instance_count == 1
     assert len(set(assigned_user_ids)) == POOL_SIZE
     assert state.peak_posts >= POOL_SIZE
     assert pool_status == {
@@ -191,7 +194,10 @@ async def test_guest_pool_handles_many_concurrent_requests(monkeypatch):
 
 
 @pytest.mark.asyncio
-async def test_guest_pool_recovers_from_failures_under_concurrency(monkeypatch):
+async def test_guest_pool_recovers_from_failures_under_concurrency(
+    monkeypatch,
+    ping_request,
+):
     pool = await _build_pool(monkeypatch, FAILURE_POOL_SIZE)
     assigned_user_ids: list[str] = []
     state = LoadState()
@@ -207,7 +213,7 @@ async def test_guest_pool_recovers_from_failures_under_concurrency(monkeypatch):
     )
 
     results = await asyncio.gather(
-        *(client.chat_completion(_make_request()) for _ in range(FAILURE_REQUEST_COUNT))
+        *(client.chat_completion(ping_request) for _ in range(FAILURE_REQUEST_COUNT))
     )
     pool_status = pool.get_pool_status()
     current_user_ids = set(pool._sessions)
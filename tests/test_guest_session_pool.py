@@ -95,3 +95,29 @@ async def test_acquire_skips_duplicate_excluded_session_without_overwriting_pool
     assert acquired.active_requests == 1
     assert set(pool._sessions) == {"user-1", "user-2"}
     assert pool._sessions["user-1"].token == "token-seed"
+
+
+@pytest.mark.asyncio
+async def test_ensure_capacity_bounds_concurrent_session_creation(monkeypatch):
+    pool = GuestSessionPool(pool_size=12)
+    pool._create_parallelism = 3
+    active = 0
+    peak = 0
+    counter = 0
+
+    async def fake_create_session() -> GuestSession:
+        nonlocal active, peak, counter
+        active += 1
+        peak = max(peak, active)
+        counter += 1
+        user_id = f"user-{counter}"
+        await asyncio.sleep(0.01)
+        active -= 1
+        return _make_session(user_id, user_id)
+
+    monkeypatch.setattr(pool, "_create_session", fake_create_session)
+
+    await pool._ensure_capacity()
+
+    assert len(pool._sessions) == 12
+    assert peak == 3
@@ -0,0 +1,41 @@
+import json
+
+import pytest
+
+from app.core import upstream as upstream_module
+from app.core.claude_compat import sse
+from app.core.openai_compat import format_sse_chunk
+from app.utils.json_codec import dumps_json, dumps_json_bytes
+
+HUGE_INT = 2**70
+TOOL_ARGUMENTS = {"name": "lookup", "input": {"id": HUGE_INT, "label": "数字"}}
+
+
+def test_dumps_json_uses_compact_utf8_output():
+    assert dumps_json({"a": [1, 2], "b": "中文"}) == '{"a":[1,2],"b":"中文"}'
+
+
+def test_dumps_json_falls_back_for_integers_beyond_64_bits():
+    encoded = dumps_json_bytes(TOOL_ARGUMENTS)
+
+    assert json.loads(encoded) == TOOL_ARGUMENTS
+    assert "数字".encode("utf-8") in encoded
+
+
+@pytest.mark.parametrize(
+    "render",
+    [
+        lambda: sse("content_block_start", TOOL_ARGUMENTS),
+        lambda: upstream_module._encode_json_body(TOOL_ARGUMENTS).decode("utf-8"),
+    ],
+    ids=["claude-sse", "upstream-body"],
+)
+def test_serializers_accept_integers_beyond_64_bits(render):
+    assert str(HUGE_INT) in render()
+
+
+@pytest.mark.asyncio
+async def test_openai_sse_chunk_accepts_integers_beyond_64_bits():
+    chunk = await format_sse_chunk(TOOL_ARGUMENTS)
+
+    assert str(HUGE_INT) in chunk
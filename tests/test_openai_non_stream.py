@@ -0,0 +1,31 @@
+import json
+
+import pytest
+
+from app.core.openai import handle_non_stream_response
+from app.models.schemas import Message, OpenAIRequest
+
+
+@pytest.mark.asyncio
+async def test_handle_non_stream_response_assigns_unique_ids():
+    request = OpenAIRequest(
+        model="GLM-4.5",
+        messages=[Message(role="user", content="ping")],
+        stream=False,
+    )
+
+    def stream_response():
+        async def _chunks():
+            yield 'data: {"choices": [{"delta": {"content": "pong"}}]}\n\n'
+            yield "data: [DONE]\n\n"
+
+        return _chunks()
+
+    first_response = await handle_non_stream_response(stream_response, request)
+    second_response = await handle_non_stream_response(stream_response, request)
+    first = json.loads(first_response.body)
+    second = json.loads(second_response.body)
+
+    assert first["choices"][0]["message"]["content"] == "pong"
+    assert first["id"].startswith("chatcmpl-")
+    assert first["id"] != second["id"]
@@ -1,7 +1,14 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.utils import request_logging
 from app.utils.request_logging import (
     extract_claude_usage,
     extract_openai_usage,
+    wrap_openai_stream_with_logging,
 )
+from app.utils.request_source import RequestSourceInfo
 
 
 def test_extract_openai_usage_supports_cached_prompt_details():
@@ -46,3 +53,100 @@ def test_extract_claude_usage_supports_cache_token_fields():
         "cache_read_tokens": 48,
         "total_tokens": 392,
     }
+
+
+def _source_info() -> RequestSourceInfo:
+    return RequestSourceInfo(
+        endpoint="/v1/chat/completions",
+        source="test",
+        protocol="openai",
+        client_name="pytest",
+        user_agent="pytest",
+    )
+
+
+@pytest.mark.asyncio
+async def test_wrap_openai_stream_records_usage_after_content(monkeypatch):
+    chunks = [
+        'data: {"choices": [{"delta": {"content": "hi"}}]}\n\n',
+        r'data: {"choices": [{"delta": {"content": "\"usage\""}}]}' "\n\n",
+        'data: {"choices": [], "usage": {"prompt_tokens": 4, '
+        '"completion_tokens": 2, "total_tokens": 6}}\n\n',
+        "data: [DONE]\n\n",
+    ]
+
+    async def upstream_stream():
+        for chunk in chunks:
+            yield chunk
+
+    write_log = AsyncMock(return_value=None)
+    monkeypatch.setattr(request_logging, "write_request_log", write_log)
+
+    outputs = [
+        chunk
+        async for chunk in wrap_openai_stream_with_logging(
+            upstream_stream(),
+            provider="zai",
+            model="GLM-4.5",
+            source_info=_source_info(),
+            started_at=0.0,
+        )
+    ]
+
+    assert outputs == chunks
+    log_kwargs = write_log.await_args.kwargs
+    assert log_kwargs["success"] is True
+    assert log_kwargs["first_token_time"] > 0
+    assert log_kwargs["input_tokens"] == 4
+    assert log_kwargs["output_tokens"] == 2
+    assert log_kwargs["total_tokens"] == 6
+
+
+@pytest.mark.asyncio
+async def test_wrap_openai_stream_closes_upstream_on_early_exit(monkeypatch):
+    closed = False
+
+    async def upstream_stream():
+        nonlocal closed
+        try:
+            yield 'data: {"choices": [{"delta": {"content": "hi"}}]}\n\n'
+            yield 'data: {"choices": [{"delta": {"content": "there"}}]}\n\n'
+        finally:
+            closed = True
+
+    write_log = AsyncMock(return_value=None)
+    monkeypatch.setattr(request_logging, "write_request_log", write_log)
+
+    wrapped = wrap_openai_stream_with_logging(
+        upstream_stream(),
+        provider="zai",
+        model="GLM-4.5",
+        source_info=_source_info(),
+        started_at=0.0,
+    )
+    async for _ in wrapped:
+        break
+    await wrapped.aclose()
+
+    assert closed is True
+    write_log.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_write_request_log_truncates_error_message(monkeypatch):
+    dao = AsyncMock()
+    monkeypatch.setattr(request_logging, "get_request_log_dao", lambda: dao)
+
+    await request_logging.write_request_log(
+        provider="zai",
+        model="GLM-4.5",
+        source_info=_source_info(),
+        success=False,
+        started_at=0.0,
+        status_code=502,
+        error_message="<html>" + "x" * 10_000,
+    )
+
+    error_message = dao.add_log.await_args.kwargs["error_message"]
+    assert len(error_message) == request_logging.REQUEST_LOG_ERROR_MAX_CHARS
+    assert error_message.startswith("<html>")
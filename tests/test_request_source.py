@@ -0,0 +1,37 @@
+import pytest
+from starlette.requests import Request
+
+from app.utils.request_source import detect_request_source
+
+
+def _make_request(user_agent: str, path: str = "/v1/chat/completions") -> Request:
+    scope = {
+        "type": "http",
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "headers": [(b"user-agent", user_agent.encode())],
+        "client": ("testclient", 50000),
+        "server": ("testserver", 80),
+    }
+    return Request(scope)
+
+
+@pytest.mark.parametrize(
+    ("user_agent", "expected_source"),
+    [
+        ("claude-cli/1.0.0 (external, cli)", "claude_code"),
+        ("Claude Code/2.1", "claude_code"),
+        ("python-httpx/0.28.1", "custom_http_client"),
+        ("python-requests/2.32", "custom_http_client"),
+        ("curl/8.5.0", "curl"),
+        ("Mozilla/5.0", "browser"),
+    ],
+)
+def test_detect_request_source_matches_user_agent_keywords(user_agent, expected_source):
+    info = detect_request_source(_make_request(user_agent))
+
+    assert info.source == expected_source
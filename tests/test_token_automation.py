@@ -1,5 +1,8 @@
+import asyncio
+
 import pytest
 
+from app.services import token_dao as token_dao_module
 from app.services.token_automation import run_token_maintenance
 from app.services.token_dao import TokenDAO
 from app.utils.token_pool import ZAITokenValidator
@@ -17,7 +20,7 @@ async def test_run_token_maintenance_deletes_invalid_tokens_after_validation(
     await dao.add_token("zai", "token-guest", validate=False)
     await dao.add_token("zai", "token-invalid", validate=False)
 
-    async def fake_validate_token(cls, token):
+    async def fake_validate_token(cls, token, client=None):
         mapping = {
             "token-valid": ("user", True, None),
             "token-guest": ("guest", False, "guest token"),
@@ -49,3 +52,56 @@ async def test_run_token_maintenance_deletes_invalid_tokens_after_validation(
     remaining_tokens = await dao.get_tokens_by_provider("zai", enabled_only=False)
     assert [token["token"] for token in remaining_tokens] == ["token-valid"]
     assert remaining_tokens[0]["token_type"] == "user"
+
+
+@pytest.mark.asyncio
+async def test_validate_tokens_detailed_bounds_concurrency(tmp_path, monkeypatch):
+    dao = TokenDAO(str(tmp_path / "tokens.db"))
+    await dao.init_database()
+
+    token_count = token_dao_module.TOKEN_VALIDATION_PARALLELISM * 3
+    for index in range(token_count):
+        await dao.add_token("zai", f"token-{index}", validate=False)
+
+    active = 0
+    peak = 0
+    seen_clients = []
+
+    class FakeAsyncClient:
+        instance_count = 0
+
+        def __init__(self, *args, **kwargs):
+            type(self).instance_count += 1
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, exc_type, exc, tb):
+            return False
+
+    async def fake_validate_token(cls, token, client=None):
+        nonlocal active, peak
+        seen_clients.append(client)
+        active += 1
+        peak = max(peak, active)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            active -= 1
+        return ("user", True, None)
+
+    monkeypatch.setattr(
+        ZAITokenValidator,
+        "validate_token",
+        classmethod(fake_validate_token),
+    )
+    monkeypatch.setattr(token_dao_module.httpx, "AsyncClient", FakeAsyncClient)
+
+    stats = await dao.validate_tokens_detailed("zai")
+
+    assert stats["checked"] == token_count
+    assert stats["valid"] == token_count
+    assert peak == token_dao_module.TOKEN_VALIDATION_PARALLELISM
+    assert FakeAsyncClient.instance_count == 1
+    assert isinstance(seen_clients[0], FakeAsyncClient)
+    assert all(client is seen_clients[0] for client in seen_clients)
@@ -0,0 +1,121 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.utils import token_pool as token_pool_module
+from app.utils.token_pool import TokenPool
+
+
+class FakeAuthResponse:
+    status_code = 200
+
+    def __init__(self, role: str):
+        self._role = role
+
+    def json(self):
+        return {"id": "user", "role": self._role}
+
+
+def _build_fake_async_client(instances: list, delay: float = 0.0):
+    class FakeAsyncClient:
+        def __init__(self, *args, **kwargs):
+            self.requested_tokens: list[str] = []
+            self.active_requests = 0
+            self.peak_requests = 0
+            instances.append(self)
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, exc_type, exc, tb):
+            return False
+
+        async def get(self, url, headers=None):
+            token = headers["Authorization"].removeprefix("Bearer ")
+            self.requested_tokens.append(token)
+            self.active_requests += 1
+            self.peak_requests = max(self.peak_requests, self.active_requests)
+            try:
+                await asyncio.sleep(delay)
+            finally:
+                self.active_requests -= 1
+            return FakeAuthResponse("guest" if token == "guest-token" else "user")
+
+    return FakeAsyncClient
+
+
+@pytest.mark.asyncio
+async def test_health_check_all_shares_one_http_client(monkeypatch):
+    instances: list = []
+    pool = TokenPool(
+        [
+            (1, "user-token-1", "user"),
+            (2, "user-token-2", "user"),
+            (3, "guest-token", "user"),
+        ]
+    )
+    monkeypatch.setattr(
+        token_pool_module.httpx,
+        "AsyncClient",
+        _build_fake_async_client(instances),
+    )
+    monkeypatch.setattr(pool, "record_token_success", AsyncMock(return_value=None))
+    monkeypatch.setattr(pool, "record_token_failure", AsyncMock(return_value=None))
+
+    await pool.health_check_all()
+
+    assert len(instances) == 1
+    assert sorted(instances[0].requested_tokens) == [
+        "guest-token",
+        "user-token-1",
+        "user-token-2",
+    ]
+    assert pool.record_token_success.await_count == 2
+    assert pool.record_token_failure.await_count == 1
+    assert pool.token_statuses["guest-token"].token_type == "guest"
+
+
+@pytest.mark.asyncio
+async def test_health_check_all_bounds_concurrency(monkeypatch):
+    instances: list = []
+    token_count = token_pool_module.TOKEN_HEALTH_CHECK_PARALLELISM * 3
+    pool = TokenPool(
+        [(index, f"user-token-{index}", "user") for index in range(token_count)]
+    )
+    monkeypatch.setattr(
+        token_pool_module.httpx,
+        "AsyncClient",
+        _build_fake_async_client(instances, delay=0.01),
+    )
+    monkeypatch.setattr(pool, "record_token_success", AsyncMock(return_value=None))
+    monkeypatch.setattr(pool, "record_token_failure", AsyncMock(return_value=None))
+
+    await pool.health_check_all()
+
+    assert len(instances[0].requested_tokens) == token_count
+    parallelism = token_pool_module.TOKEN_HEALTH_CHECK_PARALLELISM
+    assert instances[0].peak_requests == parallelism
+
+
+def test_get_pool_status_counts_tokens_by_type():
+    pool = TokenPool(
+        [
+            (1, "user-token-aaaaaaaaaaaa", "user"),
+            (2, "user-token-bbbbbbbbbbbb", "user"),
+            (3, "guest-token-cccccccccccc", "guest"),
+            (4, "unknown-token-dddddddddd", "unknown"),
+        ]
+    )
+    pool.token_statuses["user-token-bbbbbbbbbbbb"].is_available = False
+
+    status = pool.get_pool_status()
+
+    assert status["total_tokens"] == 4
+    assert status["available_tokens"] == 1
+    assert status["unavailable_tokens"] == 3
+    assert status["healthy_tokens"] == 1
+    assert status["user_tokens"] == 2
+    assert status["guest_tokens"] == 1
+    assert status["unknown_tokens"] == 1
+    assert [item["token_id"] for item in status["tokens"]] == [1, 2, 3, 4]
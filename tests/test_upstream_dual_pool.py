@@ -1,8 +1,11 @@
 import asyncio
 import types
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
 from unittest.mock import AsyncMock
 
+import httpx
+import orjson
 import pytest
 
 from app.core import upstream as upstream_module
@@ -78,8 +81,12 @@ def _build_fake_async_client(handler):
         async def __aexit__(self, exc_type, exc, tb):
             return False
 
-        async def post(self, url, headers=None, json=None):
-            return await handler(headers or {})
+        async def post(self, url, headers=None, content=None):
+            return await handler(headers or {}, orjson.loads(content))
+
+        @asynccontextmanager
+        async def stream(self, method, url, headers=None, content=None, timeout=None):
+            yield await handler(headers or {}, orjson.loads(content))
 
     return FakeAsyncClient
 
@@ -184,7 +191,10 @@ async def test_authenticated_tokens_are_used_before_guest_pool(monkeypatch):
         acquire_calls += 1
         return await original_acquire(*args, **kwargs)
 
-    async def handler(headers):
+    sent_bodies: list[dict] = []
+
+    async def handler(headers, body):
+        sent_bodies.append(body)
         await asyncio.sleep(MIXED_REQUEST_DELAY)
         return FakeResponse(200)
 
@@ -208,6 +218,7 @@ async def test_authenticated_tokens_are_used_before_guest_pool(monkeypatch):
     assert all(result["ok"] is True for result in results)
     assert all(item["token_source"] == "auth_pool" for item in captures)
     assert acquire_calls == 0
+    assert sent_bodies == [{"model": "GLM-4.5"}] * AUTH_REQUEST_COUNT
     assert token_pool.success_tokens == ["auth-1"] * AUTH_REQUEST_COUNT
     assert token_pool.failure_tokens == []
     assert pool_status["busy_sessions"] == 0
@@ -230,7 +241,7 @@ async def test_authenticated_401_retries_next_token_before_guest_fallback(monkey
         acquire_calls += 1
         return await original_acquire(*args, **kwargs)
 
-    async def handler(headers):
+    async def handler(headers, body):
         token = headers["x-token"]
         if token == "auth-1":
             return FakeResponse(401, '{"message":"expired"}')
@@ -270,7 +281,7 @@ async def test_authenticated_pool_exhaustion_falls_back_to_guest(monkeypatch):
     )
     captures: list[dict] = []
 
-    async def handler(headers):
+    async def handler(headers, body):
         if headers["x-token-source"] == "auth_pool":
             return FakeResponse(401, '{"message":"expired"}')
         return FakeResponse(200)
@@ -312,7 +323,7 @@ async def test_guest_retry_is_isolated_and_does_not_pollute_auth_stats(monkeypat
     )
     captures: list[dict] = []
 
-    async def handler(headers):
+    async def handler(headers, body):
         source = headers["x-token-source"]
         guest_user_id = headers["x-guest-user-id"]
         if source == "auth_pool":
@@ -405,3 +416,209 @@ async def test_report_failure_only_retires_target_guest_session(monkeypatch):
     assert "guest-3" in current_user_ids
     assert "guest-4" in current_user_ids
     assert deleted_before_close == ["guest-1"]
+
+
+@pytest.mark.asyncio
+async def test_direct_guest_auth_backs_off_exponentially(monkeypatch):
+    delays: list[float] = []
+
+    class FailingAsyncClient:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, exc_type, exc, tb):
+            return False
+
+        async def get(self, url, headers=None):
+            raise upstream_module.httpx.ConnectError("offline")
+
+    def fake_retry_delay(attempt):
+        delays.append(attempt)
+        return 0
+
+    monkeypatch.setattr(upstream_module.httpx, "AsyncClient", FailingAsyncClient)
+    monkeypatch.setattr(upstream_module, "_guest_auth_retry_delay", fake_retry_delay)
+
+    auth_info = await UpstreamClient()._fetch_direct_guest_auth()
+
+    assert auth_info["token"] == ""
+    assert delays == list(range(upstream_module.GUEST_AUTH_MAX_RETRIES - 1))
+
+
+@pytest.mark.parametrize("attempt", [0, 1, 2])
+def test_guest_auth_retry_delay_doubles_with_equal_jitter(attempt):
+    ceiling = upstream_module.GUEST_AUTH_RETRY_BASE_DELAY_SECONDS * (2 ** attempt)
+
+    for _ in range(50):
+        delay = upstream_module._guest_auth_retry_delay(attempt)
+        assert ceiling / 2 <= delay <= ceiling
+
+
+def test_shared_client_cookie_jar_ignores_upstream_set_cookie():
+    cookies = httpx.Cookies(upstream_module._build_stateless_cookie_jar())
+    response = httpx.Response(
+        200,
+        headers={"set-cookie": "token=guest-token; Path=/"},
+        request=httpx.Request("POST", "https://chat.z.ai/api/v1/chats/new"),
+    )
+
+    cookies.extract_cookies(response)
+
+    assert len(cookies.jar) == 0
+
+
+def test_json_body_is_preencoded_as_compact_utf8():
+    body = {"model": "glm-4.7", "messages": [{"role": "user", "content": "你好"}]}
+
+    encoded = upstream_module._encode_json_body(body)
+
+    expected = '{"model":"glm-4.7","messages":[{"role":"user","content":"你好"}]}'
+    assert encoded == expected.encode()
+
+
+@pytest.mark.asyncio
+async def test_successful_response_body_is_not_parsed_for_errors(monkeypatch):
+    token_pool = StubTokenPool(["auth-1", "auth-2"])
+    captures: list[dict] = []
+
+    class UnreadResponse(FakeResponse):
+        @property
+        def text(self):
+            raise AssertionError("200 响应不应被解码为错误文本")
+
+        @text.setter
+        def text(self, value):
+            pass
+
+    async def handler(headers, body):
+        return UnreadResponse(200)
+
+    client = UpstreamClient()
+    _bind_minimal_request_flow(client, captures)
+    _patch_upstream_dependencies(
+        monkeypatch,
+        token_pool=token_pool,
+        guest_pool=None,
+        async_client_cls=_build_fake_async_client(handler),
+    )
+
+    result = await client.chat_completion(_make_request())
+
+    assert result["ok"] is True
+    assert [item["token"] for item in captures] == ["auth-1"]
+    assert token_pool.failure_tokens == []
+    assert token_pool.success_tokens == ["auth-1"]
+
+
+class FakeSSEResponse:
+    status_code = 200
+
+    def __init__(self, lines: list[str]):
+        self._body = "\n".join(lines).encode("utf-8")
+
+    async def aiter_bytes(self):
+        yield self._body
+
+
+@pytest.mark.asyncio
+async def test_stream_request_sends_encoded_body_through_shared_client(monkeypatch):
+    token_pool = StubTokenPool(["auth-1"])
+    captures: list[dict] = []
+    sent_bodies: list[dict] = []
+    answer = {
+        "type": "chat:completion",
+        "data": {"phase": "answer", "delta_content": "Hi"},
+    }
+    done = {"type": "chat:completion", "data": {"phase": "answer", "done": True}}
+
+    async def handler(headers, body):
+        sent_bodies.append(body)
+        return FakeSSEResponse(
+            [
+                f"data: {orjson.dumps(answer).decode()}",
+                "",
+                f"data: {orjson.dumps(done).decode()}",
+                "",
+            ]
+        )
+
+    client = UpstreamClient()
+    _bind_minimal_request_flow(client, captures)
+    _patch_upstream_dependencies(
+        monkeypatch,
+        token_pool=token_pool,
+        guest_pool=None,
+        async_client_cls=_build_fake_async_client(handler),
+    )
+
+    stream_request = _make_request().model_copy(update={"stream": True})
+    stream = await client.chat_completion(stream_request)
+    chunks = [chunk async for chunk in stream]
+
+    assert sent_bodies == [{"model": "GLM-4.5"}]
+    assert any('"content":"Hi"' in chunk for chunk in chunks)
+    assert chunks[-1] == "data: [DONE]\n\n"
+    assert token_pool.success_tokens == ["auth-1"]
+
+
+def _build_closable_fake_client():
+    class ClosableAsyncClient:
+        instances: list = []
+
+        def __init__(self, *args, **kwargs):
+            self.proxy = kwargs.get("proxy")
+            self.closed = False
+            type(self).instances.append(self)
+
+        async def aclose(self):
+            self.closed = True
+
+    return ClosableAsyncClient
+
+
+@pytest.mark.asyncio
+async def test_proxy_change_rebuilds_client_and_closes_old_one(monkeypatch):
+    client_cls = _build_closable_fake_client()
+    monkeypatch.setattr(upstream_module.httpx, "AsyncClient", client_cls)
+    monkeypatch.setattr(upstream_module, "UPSTREAM_RETIRED_CLIENT_GRACE_SECONDS", 0)
+    client = UpstreamClient()
+    proxies = iter(["http://proxy-a:8080", "http://proxy-b:8080"])
+    current = {"proxy": next(proxies)}
+    monkeypatch.setattr(client, "_get_proxy_config", lambda: current["proxy"])
+
+    first = await client._get_http_client()
+    assert await client._get_http_client() is first
+
+    current["proxy"] = next(proxies)
+    second = await client._get_http_client()
+    await asyncio.gather(*client._retired_client_tasks)
+
+    assert second is not first
+    assert second.proxy == "http://proxy-b:8080"
+    assert first.closed is True
+    assert second.closed is False
+
+    await client.close()
+    assert second.closed is True
+
+
+@pytest.mark.asyncio
+async def test_close_shuts_retired_clients_without_waiting_for_grace(monkeypatch):
+    client_cls = _build_closable_fake_client()
+    monkeypatch.setattr(upstream_module.httpx, "AsyncClient", client_cls)
+    client = UpstreamClient()
+    current = {"proxy": None}
+    monkeypatch.setattr(client, "_get_proxy_config", lambda: current["proxy"])
+
+    first = await client._get_http_client()
+    current["proxy"] = "socks5://proxy:1080"
+    await client._get_http_client()
+
+    await asyncio.wait_for(client.close(), timeout=1)
+
+    assert all(instance.closed for instance in client_cls.instances)
+    assert first.closed is True
+    assert client._retired_client_tasks == set()
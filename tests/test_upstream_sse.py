@@ -0,0 +1,141 @@
+import json
+
+import pytest
+
+from app.core.upstream import UpstreamClient, _iter_sse_events
+from app.models.schemas import Message, OpenAIRequest
+
+
+def _sse_event(payload: dict) -> list[str]:
+    return [f"data: {json.dumps(payload, ensure_ascii=False)}", ""]
+
+
+def _completion_event(**data) -> list[str]:
+    return _sse_event({"type": "chat:completion", "data": data})
+
+
+USAGE = {"prompt_tokens": 3, "completion_tokens": 2, "total_tokens": 5}
+
+SPLITTER_LINES = [
+    ": keep-alive",
+    "event: message",
+    'data: {"a":',
+    "data: 1}\r",
+    "\r",
+    "data: [DONE]",
+    "",
+    'data: {"b":1}',
+    'data: {"c":2}',
+    "",
+    '{"error": {"message": "boom"}}',
+    "data: 尾巴",
+]
+
+NON_STREAM_LINES = [
+    *_completion_event(phase="answer", delta_content="你好"),
+    *_completion_event(phase="answer", delta_content="，世界"),
+    *_completion_event(phase="answer", delta_content="", usage=USAGE, done=True),
+    "data: [DONE]",
+    "",
+]
+
+STREAM_LINES = [
+    *_completion_event(phase="answer", delta_content="Hi"),
+    *_completion_event(phase="answer", delta_content="", done=True),
+]
+
+
+class FakeStreamResponse:
+    def __init__(self, lines: list[str], chunk_size: int = 7):
+        self._body = "\n".join(lines).encode("utf-8")
+        self._chunk_size = chunk_size
+
+    async def aiter_bytes(self):
+        for start in range(0, len(self._body), self._chunk_size):
+            yield self._body[start:start + self._chunk_size]
+
+
+async def _collect(async_iterable) -> list:
+    return [item async for item in async_iterable]
+
+
+@pytest.mark.asyncio
+async def test_iter_sse_events_splits_on_blank_lines():
+    events = await _collect(
+        _iter_sse_events(FakeStreamResponse(SPLITTER_LINES, chunk_size=3).aiter_bytes())
+    )
+
+    assert events == [
+        (True, b'{"a":\n1}'),
+        (True, b"[DONE]"),
+        (True, b'{"b":1}'),
+        (True, b'{"c":2}'),
+        (False, b'{"error": {"message": "boom"}}'),
+        (True, "尾巴".encode("utf-8")),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_iter_sse_events_yields_newline_framed_events_without_waiting():
+    lines = [line for line in NON_STREAM_LINES if line.startswith("data: {")]
+    consumed = 0
+
+    async def chunks():
+        nonlocal consumed
+        for line in lines:
+            consumed += 1
+            yield f"{line}\n".encode("utf-8")
+
+    events = _iter_sse_events(chunks())
+    for index, line in enumerate(lines):
+        is_data, payload = await events.__anext__()
+
+        assert is_data is True
+        assert payload == line[6:].encode("utf-8")
+        assert consumed == index + 1
+
+    await events.aclose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "lines",
+    [NON_STREAM_LINES, [line for line in NON_STREAM_LINES if line]],
+    ids=["blank-line-framed", "newline-framed"],
+)
+async def test_non_stream_response_aggregates_sse_events(lines):
+    client = UpstreamClient()
+    result = await client._handle_non_stream_response(
+        FakeStreamResponse(lines),
+        "chat-1",
+        "GLM-4.5",
+    )
+
+    assert result["choices"][0]["message"]["content"] == "你好，世界"
+    assert result["usage"] == USAGE
+
+
+@pytest.mark.asyncio
+async def test_stream_response_emits_openai_chunks_until_done():
+    request = OpenAIRequest(
+        model="GLM-4.5",
+        messages=[Message(role="user", content="ping")],
+        stream=True,
+    )
+
+    client = UpstreamClient()
+    outputs = await _collect(
+        client._handle_stream_response(
+            FakeStreamResponse(STREAM_LINES),
+            "chat-1",
+            "GLM-4.5",
+            request,
+            {},
+        )
+    )
+    payloads = [json.loads(item[6:]) for item in outputs[:-1]]
+
+    assert outputs[-1] == "data: [DONE]\n\n"
+    assert payloads[0]["choices"][0]["delta"] == {"role": "assistant"}
+    assert payloads[1]["choices"][0]["delta"] == {"content": "Hi"}
+    assert payloads[-1]["choices"][0]["finish_reason"] == "stop"
@@ -0,0 +1,38 @@
+import pytest
+
+from app.utils import user_agent as user_agent_module
+
+CHROME_UA = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/141.0.0.0 Safari/537.36"
+)
+EDGE_UA = f"{CHROME_UA} Edg/140.0.1.2"
+
+
+@pytest.mark.parametrize(
+    ("user_agent", "expected_sec_ch_ua"),
+    [
+        (
+            CHROME_UA,
+            '"Not_A Brand";v="8", "Chromium";v="141", "Google Chrome";v="141"',
+        ),
+        (
+            EDGE_UA,
+            '"Microsoft Edge";v="140", "Chromium";v="141", "Not_A Brand";v="24"',
+        ),
+    ],
+)
+def test_get_dynamic_headers_derives_sec_ch_ua_from_user_agent(
+    monkeypatch,
+    user_agent,
+    expected_sec_ch_ua,
+):
+    monkeypatch.setattr(
+        user_agent_module,
+        "get_random_user_agent",
+        lambda browser_type=None: user_agent,
+    )
+
+    headers = user_agent_module.get_dynamic_headers()
+
+    assert headers["sec-ch-ua"] == expected_sec_ch_ua